@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import random
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+TOKEN = "bench-token"
+
+_Handler = Callable[["FakeCloud", web.Request], Awaitable[web.Response]]
+
+
+def _simulated(endpoint: str, *, authenticated: bool = True) -> Callable[[_Handler], _Handler]:
+    def decorator(handler: _Handler) -> _Handler:
+        @functools.wraps(handler)
+        async def wrapper(self: FakeCloud, request: web.Request) -> web.Response:
+            failed = await self._simulate(endpoint, request if authenticated else None)
+            # aiohttp responses are falsy, so test for None rather than truthiness.
+            if failed is not None:
+                return failed
+            return await handler(self, request)
+
+        return wrapper
+
+    return decorator
+
+
+@dataclass
+class FakeCloudConfig:
+    devices: int = 10
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    seed: int | None = None
+    retry_after: float = 1.0
+    hang: float = 1.0
+
+
+@dataclass
+class FakeCloudStats:
+    requests: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+
+class FakeCloud:
+    def __init__(self, config: FakeCloudConfig) -> None:
+        self.config = config
+        self.stats = FakeCloudStats()
+        self._random = random.Random(config.seed)
+        self._runner: web.AppRunner | None = None
+        self.base = ""
+        self.codes = [f"DEV{index:04d}" for index in range(config.devices)]
+        self.token = TOKEN
+        self._faults: dict[str, deque[str]] = {}
+        self._logins = 0
+
+    # Faults are consumed one per request: "timeout", "malformed", "expired" (JSON
+    # token error), an HTTP status such as "429"/"503"/"401", or "ok" to pass one.
+    def inject(self, endpoint: str, *faults: str) -> None:
+        self._faults.setdefault(endpoint, deque()).extend(faults)
+
+    def expire_token(self) -> None:
+        self.token = f"{TOKEN}-{self._logins}-expired"
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/user/login", self._login)
+        app.router.add_post("/device/deviceList", self._device_list)
+        app.router.add_post("/device/getDeviceStatus", self._device_status)
+        app.router.add_post("/device/getDataByCode", self._data_by_code)
+        app.router.add_post("/device/control", self._control)
+        return app
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = f"http://127.0.0.1:{port}"
+        return self.base
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _simulate(
+        self, endpoint: str, request: web.Request | None = None
+    ) -> web.Response | None:
+        self.stats.requests[endpoint] = self.stats.requests.get(endpoint, 0) + 1
+        delay = self.config.latency + self._random.uniform(-1, 1) * self.config.jitter
+        await asyncio.sleep(max(0.0, delay))
+        faults = self._faults.get(endpoint)
+        if faults and (fault := faults.popleft()) != "ok":
+            self.stats.errors += 1
+            return await self._fault(fault)
+        if self._random.random() < self.config.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=503, text="unavailable")
+        if request is not None and request.headers.get("x-token") != self.token:
+            return await self._fault("expired")
+        return None
+
+    async def _fault(self, fault: str) -> web.Response:
+        if fault == "timeout":
+            await asyncio.sleep(self.config.hang)
+            return web.Response(status=504, text="too late")
+        if fault == "429":
+            return web.Response(
+                status=429, headers={"Retry-After": f"{self.config.retry_after:g}"}
+            )
+        if fault == "malformed":
+            return web.Response(status=200, text="<html>maintenance</html>")
+        if fault == "expired":
+            return web.json_response({"error_code": "-100", "error_msg": "token invalid"})
+        return web.Response(status=int(fault), text=fault)
+
+    @_simulated("login", authenticated=False)
+    async def _login(self, request: web.Request) -> web.Response:
+        self._logins += 1
+        self.token = f"{TOKEN}-{self._logins}"
+        return web.json_response({"error_code": "0", "objectResult": {"x-token": self.token}})
+
+    @_simulated("deviceList")
+    async def _device_list(self, request: web.Request) -> web.Response:
+        devices = [
+            {"deviceCode": code, "deviceName": code, "custModel": "BENCH"} for code in self.codes
+        ]
+        return web.json_response({"error_code": "0", "objectResult": devices})
+
+    @_simulated("getDeviceStatus")
+    async def _device_status(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"error_code": "0", "objectResult": {"status": "ONLINE", "isFault": False}}
+        )
+
+    @_simulated("getDataByCode")
+    async def _data_by_code(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        values = [
+            {"code": code, "value": f"{self._random.uniform(20, 50):.1f}"}
+            for code in payload.get("protocalCodes", [])
+        ]
+        return web.json_response({"error_code": "0", "objectResult": values})
+
+    @_simulated("control")
+    async def _control(self, request: web.Request) -> web.Response:
+        return web.json_response({"error_code": "0", "objectResult": True})
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig
+from homeassistant.core import HomeAssistant
+
+from custom_components.warmlink.api import WarmlinkApi
+from custom_components.warmlink.coordinator import WarmlinkCoordinator
+
+from .fake_cloud import FakeCloud, FakeCloudConfig
+
+MANIFEST = Path(__file__).resolve().parent.parent / "custom_components" / "warmlink" / "manifest.json"
+
+
+def _percentile(samples: list[float], pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(samples: list[float]) -> dict[str, float | None]:
+    return {
+        "mean": sum(samples) / len(samples) if samples else None,
+        "p50": _percentile(samples, 50),
+        "p99": _percentile(samples, 99),
+        "max": max(samples, default=None),
+    }
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.01) -> None:
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self.blocked = 0.0
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = loop.time() - start - self._interval
+            if lag > 0:
+                self.blocked += lag
+                self.max_lag = max(self.max_lag, lag)
+
+
+def _latency_trace(latencies: list[float]) -> TraceConfig:
+    trace = TraceConfig()
+
+    async def _start(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        ctx.started = time.perf_counter()
+
+    async def _end(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        latencies.append(time.perf_counter() - ctx.started)
+
+    trace.on_request_start.append(_start)
+    trace.on_request_end.append(_end)
+    return trace
+
+
+async def _run_case(devices: int, args: argparse.Namespace) -> dict[str, Any]:
+    cloud = FakeCloud(
+        FakeCloudConfig(
+            devices=devices,
+            latency=args.latency / 1000,
+            jitter=args.jitter / 1000,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+    )
+    base = await cloud.start()
+    latencies: list[float] = []
+    wall: list[float] = []
+    requests: list[int] = []
+    failed = 0
+    monitor = LoopMonitor()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        async with ClientSession(trace_configs=[_latency_trace(latencies)]) as session:
+            api = WarmlinkApi(session, "bench", "bench", base)
+            coordinator = WarmlinkCoordinator(hass, api, max_parallel=args.max_parallel)
+            monitor.start()
+            for _ in range(args.refreshes):
+                if not args.respect_schedule:
+                    coordinator._next_poll.clear()
+                before = cloud.stats.total
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                wall.append(time.perf_counter() - start)
+                requests.append(cloud.stats.total - before)
+                if not coordinator.last_update_success:
+                    failed += 1
+            await monitor.stop()
+        await hass.async_stop(force=True)
+    await cloud.stop()
+    return {
+        "devices": devices,
+        "refreshes": args.refreshes,
+        "failed_refreshes": failed,
+        "refresh_wall_time": _summary(wall),
+        "requests_per_refresh": sum(requests) / len(requests) if requests else 0,
+        "request_latency": _summary(latencies),
+        "loop_blocked_total": monitor.blocked,
+        "loop_blocked_max": monitor.max_lag,
+        "server_requests": dict(cloud.stats.requests),
+        "server_errors": cloud.stats.errors,
+    }
+
+
+def _compare(current: dict[str, Any], baseline_path: Path) -> None:
+    previous = json.loads(baseline_path.read_text())
+    baseline = {case["devices"]: case for case in previous["cases"]}
+    print(f"\nvs {baseline_path} (version {previous.get('version')})")
+    for case in current["cases"]:
+        old = baseline.get(case["devices"])
+        if old is None:
+            continue
+        new_p50 = case["refresh_wall_time"]["p50"] or 0.0
+        old_p50 = old["refresh_wall_time"]["p50"] or 0.0
+        change = (new_p50 - old_p50) / old_p50 * 100 if old_p50 else 0.0
+        print(
+            f"{case['devices']:>5} devices: refresh p50 {old_p50:.3f}s -> {new_p50:.3f}s "
+            f"({change:+.1f}%), requests/refresh "
+            f"{old['requests_per_refresh']:.1f} -> {case['requests_per_refresh']:.1f}"
+        )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    result = {
+        "version": json.loads(MANIFEST.read_text())["version"],
+        "created": datetime.now(UTC).isoformat(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "cases": [],
+    }
+    for devices in args.devices:
+        case = await _run_case(devices, args)
+        result["cases"].append(case)
+        wall = case["refresh_wall_time"]
+        latency = case["request_latency"]
+        print(
+            f"{devices:>5} devices: refresh p50 {wall['p50']:.3f}s p99 {wall['p99']:.3f}s, "
+            f"{case['requests_per_refresh']:.1f} req/refresh, "
+            f"latency p50 {latency['p50'] or 0:.3f}s p99 {latency['p99'] or 0:.3f}s, "
+            f"loop blocked {case['loop_blocked_total']:.3f}s (max {case['loop_blocked_max']:.3f}s)"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+    if args.compare:
+        _compare(result, args.compare)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Warmlink polling against a local fake cloud")
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--refreshes", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=50.0, help="mean response latency in ms")
+    parser.add_argument("--jitter", type=float, default=20.0, help="latency jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-parallel", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--respect-schedule",
+        action="store_true",
+        help="only poll devices the adaptive scheduler considers due",
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="compare against a previous JSON result")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,129 @@
 from __future__ import annotations
 
 import logging
+import os
+import time
+from typing import TYPE_CHECKING
 
-from aiohttp import ClientSession
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .api import WarmlinkApi
-from .const import CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL, DOMAIN
-from .coordinator import WarmlinkCoordinator
+from .const import (
+    CONF_BACKFILL,
+    CONF_COMPENSATION,
+    CONF_COMPENSATION_CURVE,
+    CONF_COMPENSATION_HYSTERESIS,
+    CONF_EXTRA_CODES,
+    CONF_HISTORY,
+    CONF_INVENTORY_INTERVAL,
+    CONF_LOCAL_DEVICE,
+    CONF_LOCAL_HOST,
+    CONF_LOCAL_PORT,
+    CONF_LOCAL_REGISTERS,
+    CONF_LOCAL_SLAVE,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_PARALLEL,
+    CONF_MAX_STALENESS,
+    CONF_METRICS,
+    CONF_MIN_INTERVAL,
+    CONF_PASSWORD_MODE,
+    CONF_PUSH_TOPIC,
+    CONF_SHARD_SIZE,
+    CONF_STATUS_INTERVAL,
+    CONF_SUPPLY_VOLTAGE,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_COMPENSATION_HYSTERESIS,
+    DEFAULT_INVENTORY_INTERVAL,
+    DEFAULT_LOCAL_PORT,
+    DEFAULT_LOCAL_SLAVE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SHARD_SIZE,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_SUPPLY_VOLTAGE,
+    DEFAULT_UPDATE_INTERVAL,
+    DATA_HISTORY,
+    DATA_OPTIONS,
+    DATA_PLATFORMS,
+    DOMAIN,
+    STORAGE_VERSION,
+)
+from .services import async_setup_services
+
+if TYPE_CHECKING:
+    from .coordinator import WarmlinkCoordinator
 
 PLATFORMS = ["climate", "sensor", "binary_sensor"]
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Options that shape what setup builds; changing any of them reloads the entry.
+_RELOAD_OPTIONS = (
+    CONF_STATUS_INTERVAL,
+    CONF_INVENTORY_INTERVAL,
+    CONF_EXTRA_CODES,
+    CONF_MAX_STALENESS,
+    CONF_SUPPLY_VOLTAGE,
+    CONF_METRICS,
+    CONF_BACKFILL,
+    CONF_LOCAL_DEVICE,
+    CONF_LOCAL_HOST,
+    CONF_LOCAL_PORT,
+    CONF_LOCAL_SLAVE,
+    CONF_LOCAL_REGISTERS,
+    CONF_PUSH_TOPIC,
+    CONF_SHARD_SIZE,
+    CONF_HISTORY,
+    CONF_COMPENSATION,
+    CONF_COMPENSATION_CURVE,
+    CONF_COMPENSATION_HYSTERESIS,
+)
+# Options the running coordinator applies in place.
+_LIVE_OPTIONS = (CONF_UPDATE_INTERVAL, CONF_MIN_INTERVAL, CONF_MAX_INTERVAL, CONF_MAX_PARALLEL)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
+
+
+@callback
+def _async_platforms(hass: HomeAssistant, entry: ConfigEntry) -> list[str]:
+    registered = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    known = {entity.domain for entity in registered}
+    enabled = {entity.domain for entity in registered if entity.disabled_by is None}
+    return [platform for platform in PLATFORMS if platform in enabled or platform not in known]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    session: ClientSession = async_create_clientsession(hass)
+    timings: list[tuple[str, float]] = []
+    started = mark = time.monotonic()
+
+    def _mark(stage: str) -> None:
+        nonlocal mark
+        now = time.monotonic()
+        timings.append((stage, now - mark))
+        mark = now
+
+    from .api import WarmlinkApi
+    from .coordinator import WarmlinkCoordinator
+    from .hub import async_get_hub, async_release_hub
+    from .metrics import WarmlinkMetrics
+
+    _mark("imports")
+    options = {**entry.data, **entry.options}
+    hub = async_get_hub(hass, entry.data["base"])
+    phase = hub.add_entry(entry.entry_id)
     api = WarmlinkApi(
-        session=session,
+        session=hub.session,
         username=entry.data["username"],
         password=entry.data["password"],
         base=entry.data["base"],
@@ -28,19 +132,163 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         area_code=entry.data["area_code"],
         app_id=entry.data["app_id"],
         typ=entry.data["type"],
+        password_mode=entry.data.get(CONF_PASSWORD_MODE),
+        breaker=hub.breaker,
+        limiter=hub.limiter,
+        metrics=WarmlinkMetrics() if options.get(CONF_METRICS) else None,
+    )
+    local_transports = {}
+    if options.get(CONF_LOCAL_DEVICE) and options.get(CONF_LOCAL_HOST):
+        from .modbus import ModbusTransport, parse_register_map
+
+        local_transports[options[CONF_LOCAL_DEVICE]] = ModbusTransport(
+            options[CONF_LOCAL_HOST],
+            options.get(CONF_LOCAL_PORT, DEFAULT_LOCAL_PORT),
+            options.get(CONF_LOCAL_SLAVE, DEFAULT_LOCAL_SLAVE),
+            parse_register_map(options.get(CONF_LOCAL_REGISTERS, "")),
+        )
+    coordinator = WarmlinkCoordinator(
+        hass,
+        api,
+        update_interval=options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        max_parallel=options.get(CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL),
+        min_interval=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+        max_interval=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+        status_interval=options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL),
+        inventory_interval=options.get(CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL),
+        extra_codes=[
+            code.strip()
+            for code in options.get(CONF_EXTRA_CODES, "").split(",")
+            if code.strip()
+        ],
+        max_staleness=options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+        store=Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"),
+        phase=phase,
+        supply_voltage=options.get(CONF_SUPPLY_VOLTAGE, DEFAULT_SUPPLY_VOLTAGE),
+        local_transports=local_transports,
+        shard_size=options.get(CONF_SHARD_SIZE, DEFAULT_SHARD_SIZE),
     )
-    update_interval = entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-    coordinator = WarmlinkCoordinator(hass, api, update_interval=update_interval)
-    await coordinator.async_config_entry_first_refresh()
+    _mark("build")
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await async_release_hub(hass, entry.data["base"], entry.entry_id)
+            raise
+    _mark("first data")
+
+    if options.get(CONF_BACKFILL):
+        from .statistics import WarmlinkStatisticsImporter
+
+        importer = WarmlinkStatisticsImporter(hass, coordinator, entry.entry_id)
+        await importer.async_start()
+        entry.async_on_unload(importer.async_stop)
+
+    if options.get(CONF_PUSH_TOPIC):
+        from .push import WarmlinkMqttPush
 
+        push = WarmlinkMqttPush(hass, coordinator, options[CONF_PUSH_TOPIC])
+        if await push.async_start():
+            entry.async_on_unload(push.async_stop)
+
+    if options.get(CONF_HISTORY):
+        from .history import WarmlinkHistory
+
+        history = WarmlinkHistory(hass, coordinator, entry.entry_id)
+        await history.async_start()
+        hass.data.setdefault(DOMAIN, {}).setdefault(DATA_HISTORY, {})[entry.entry_id] = history
+
+    if options.get(CONF_COMPENSATION):
+        from .compensation import WarmlinkCompensation, parse_curve
+
+        try:
+            curve = parse_curve(options.get(CONF_COMPENSATION_CURVE, ""))
+        except ValueError as err:
+            _LOGGER.error("Weather compensation disabled: %s", err)
+        else:
+            compensation = WarmlinkCompensation(
+                hass,
+                coordinator,
+                curve,
+                options.get(CONF_COMPENSATION_HYSTERESIS, DEFAULT_COMPENSATION_HYSTERESIS),
+            )
+            entry.async_on_unload(compensation.async_start())
+
+    @callback
+    def _async_persist_password_mode() -> None:
+        if api.password_mode and api.password_mode != entry.data.get(CONF_PASSWORD_MODE):
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_PASSWORD_MODE: api.password_mode}
+            )
+
+    _async_persist_password_mode()
+    entry.async_on_unload(coordinator.async_add_update_listener(_async_persist_password_mode))
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_OPTIONS, {})[entry.entry_id] = {
+        key: options.get(key) for key in (*_RELOAD_OPTIONS, *_LIVE_OPTIONS)
+    }
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    _mark("extras")
+
+    platforms = _async_platforms(hass, entry)
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    hass.data[DOMAIN].setdefault(DATA_PLATFORMS, {})[entry.entry_id] = platforms
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    _mark("platforms")
+    _LOGGER.debug(
+        "Setup of %s took %.3fs (%s; platforms: %s)",
+        entry.title,
+        time.monotonic() - started,
+        ", ".join(f"{stage} {duration:.3f}s" for stage, duration in timings),
+        ", ".join(platforms) or "none",
+    )
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    coordinator: WarmlinkCoordinator = hass.data[DOMAIN][entry.entry_id]
+    options = {**entry.data, **entry.options}
+    applied = hass.data[DOMAIN][DATA_OPTIONS][entry.entry_id]
+    current = {key: options.get(key) for key in (*_RELOAD_OPTIONS, *_LIVE_OPTIONS)}
+    if current == applied:
+        return
+    if any(current[key] != applied[key] for key in _RELOAD_OPTIONS):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    applied.update(current)
+    coordinator.async_set_options(
+        update_interval=options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        max_parallel=options.get(CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL),
+        min_interval=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+        max_interval=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    platforms = hass.data.get(DOMAIN, {}).get(DATA_PLATFORMS, {}).get(entry.entry_id, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok and DOMAIN in hass.data:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        from .hub import async_release_hub
+
+        hass.data[DOMAIN].get(DATA_PLATFORMS, {}).pop(entry.entry_id, None)
+        hass.data[DOMAIN].get(DATA_OPTIONS, {}).pop(entry.entry_id, None)
+        coordinator: WarmlinkCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        history = hass.data[DOMAIN].get(DATA_HISTORY, {}).pop(entry.entry_id, None)
+        if history is not None:
+            await history.async_stop()
+        await async_release_hub(hass, entry.data["base"], entry.entry_id)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.statistics").async_remove()
+    path = hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.history")
+    if await hass.async_add_executor_job(os.path.exists, path):
+        await hass.async_add_executor_job(os.remove, path)
@@ -1,18 +1,109 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-from typing import Any
+import random
+import time
+from typing import Any, Protocol
 
 from aiohttp import ClientError, ClientSession
 
 from .const import (
+    API_RETRIES,
+    API_RETRY_DELAY,
     API_TIMEOUT,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
     DEFAULT_APP_ID,
     DEFAULT_AREA_CODE,
     DEFAULT_LANG,
     DEFAULT_LOGIN_SOURCE,
     DEFAULT_TYPE,
 )
+from .metrics import WarmlinkMetrics
+
+PASSWORD_MODES = ("plain", "md5", "md5md5")
+
+_AUTH_ERROR_CODES = {"-100", "-101", "401", "403"}
+
+
+class RateLimiter(Protocol):
+    async def acquire(self) -> None: ...
+
+
+class WarmlinkError(Exception):
+    pass
+
+
+class WarmlinkConnectionError(WarmlinkError):
+    pass
+
+
+class WarmlinkTimeoutError(WarmlinkConnectionError):
+    pass
+
+
+class WarmlinkServerError(WarmlinkConnectionError):
+    pass
+
+
+class WarmlinkRateLimitError(WarmlinkError):
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class WarmlinkAuthError(WarmlinkError):
+    pass
+
+
+class WarmlinkResponseError(WarmlinkError):
+    pass
+
+
+class WarmlinkCircuitOpenError(WarmlinkError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    def before_request(self) -> None:
+        if self._opened_at is None:
+            return
+        now = time.monotonic()
+        if now - self._opened_at < self._reset_timeout:
+            raise WarmlinkCircuitOpenError("Warmlink cloud unavailable, skipping request")
+        # Half-open: let this request probe the cloud and fail fast for others.
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+def _retry_after(value: str | None) -> float | None:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _endpoint(url: str) -> str:
+    return url.split("?", 1)[0].rsplit("/", 1)[-1]
 
 
 def _md5_hex(value: str) -> str:
@@ -35,7 +126,34 @@ def _extract_token(data: Any) -> str | None:
     return None
 
 
+def _is_auth_failure(data: Any) -> bool:
+    if not isinstance(data, dict):
+        return False
+    code = data.get("error_code", data.get("errorCode"))
+    if code is not None and str(code).strip() in _AUTH_ERROR_CODES:
+        return True
+    message = str(data.get("error_msg") or data.get("errorMsg") or "").lower()
+    return "token" in message and any(word in message for word in ("invalid", "expire", "login"))
+
+
+def _is_success(data: dict[str, Any]) -> bool:
+    code = data.get("error_code", data.get("errorCode"))
+    if code is not None and str(code).strip() not in ("", "0"):
+        return False
+    return data.get("isReusltSuc", data.get("isResultSuc")) is not False
+
+
+def _hash_password(password: str, mode: str) -> str:
+    if mode == "md5":
+        return _md5_hex(password)
+    if mode == "md5md5":
+        return _md5_hex(_md5_hex(password))
+    return password
+
+
 class WarmlinkApi:
+    name = "cloud"
+
     def __init__(
         self,
         session: ClientSession,
@@ -47,6 +165,10 @@ class WarmlinkApi:
         area_code: str = DEFAULT_AREA_CODE,
         app_id: str = DEFAULT_APP_ID,
         typ: str = DEFAULT_TYPE,
+        password_mode: str | None = None,
+        breaker: CircuitBreaker | None = None,
+        limiter: RateLimiter | None = None,
+        metrics: WarmlinkMetrics | None = None,
     ) -> None:
         self._session = session
         self._username = username
@@ -58,12 +180,31 @@ class WarmlinkApi:
         self._app_id = app_id
         self._type = typ
         self._token: str | None = None
+        self._password_mode = password_mode if password_mode in PASSWORD_MODES else None
+        self._login_lock = asyncio.Lock()
+        self._breaker = breaker or CircuitBreaker()
+        self._limiter = limiter
+        self._metrics = metrics
 
     @property
     def token(self) -> str | None:
         return self._token
 
-    async def _request_json(
+    @property
+    def metrics(self) -> WarmlinkMetrics | None:
+        return self._metrics
+
+    @property
+    def password_mode(self) -> str | None:
+        return self._password_mode
+
+    def supports(self, code: str) -> bool:
+        return True
+
+    async def async_close(self) -> None:
+        self._token = None
+
+    async def _send(
         self, method: str, url: str, headers: dict[str, str], json_data: dict[str, Any] | None
     ) -> dict[str, Any]:
         try:
@@ -74,76 +215,154 @@ class WarmlinkApi:
                 json=json_data,
                 timeout=API_TIMEOUT,
             ) as resp:
-                return await resp.json(content_type=None)
-        except (ClientError, ValueError):
-            return {}
+                if resp.status == 429:
+                    raise WarmlinkRateLimitError(
+                        "Rate limited by Warmlink cloud",
+                        _retry_after(resp.headers.get("Retry-After")),
+                    )
+                if resp.status in (401, 403):
+                    raise WarmlinkAuthError(f"HTTP {resp.status}")
+                if resp.status >= 500:
+                    raise WarmlinkServerError(f"HTTP {resp.status}")
+                try:
+                    data = await resp.json(content_type=None)
+                except ValueError as err:
+                    raise WarmlinkResponseError("Malformed JSON response") from err
+        except TimeoutError as err:
+            raise WarmlinkTimeoutError(f"Timeout after {API_TIMEOUT}s") from err
+        except ClientError as err:
+            raise WarmlinkConnectionError(str(err)) from err
+        if not isinstance(data, dict):
+            raise WarmlinkResponseError(f"Unexpected response type {type(data).__name__}")
+        return data
+
+    async def _request_json(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        json_data: dict[str, Any] | None,
+        retries: int = 0,
+    ) -> dict[str, Any]:
+        stats = self._metrics.endpoint(_endpoint(url)) if self._metrics is not None else None
+        attempt = 0
+        while True:
+            self._breaker.before_request()
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            started = time.monotonic()
+            try:
+                data = await self._send(method, url, headers, json_data)
+            except (WarmlinkConnectionError, WarmlinkRateLimitError) as err:
+                if stats is not None:
+                    stats.record(time.monotonic() - started, False)
+                if isinstance(err, WarmlinkConnectionError):
+                    self._breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                if stats is not None:
+                    stats.retries += 1
+                delay = API_RETRY_DELAY * 2**attempt * random.uniform(0.5, 1.5)
+                if isinstance(err, WarmlinkRateLimitError) and err.retry_after:
+                    delay = max(delay, err.retry_after)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except WarmlinkError:
+                if stats is not None:
+                    stats.record(time.monotonic() - started, False)
+                self._breaker.record_success()
+                raise
+            if stats is not None:
+                stats.record(time.monotonic() - started, True)
+            self._breaker.record_success()
+            return data
 
     async def login(self) -> str | None:
-        url = f"{self._base}/user/login?lang={self._lang}"
-        for mode in ("plain", "md5", "md5md5"):
-            if mode == "plain":
-                password = self._password
-            elif mode == "md5":
-                password = _md5_hex(self._password)
-            else:
-                password = _md5_hex(_md5_hex(self._password))
-            payload = {
-                "password": password,
-                "loginSource": self._login_source,
-                "areaCode": self._area_code,
-                "appId": self._app_id,
-                "type": self._type,
-                "userName": self._username,
-            }
-            data = await self._request_json(
-                "POST", url, {"Content-Type": "application/json"}, payload
-            )
-            token = _extract_token(data)
+        modes = list(PASSWORD_MODES)
+        if self._password_mode:
+            modes.remove(self._password_mode)
+            modes.insert(0, self._password_mode)
+        for mode in modes:
+            token = await self.login_with(mode)
             if token:
-                self._token = token
                 return token
         return None
 
-    async def device_list(self) -> list[dict[str, Any]]:
-        if not self._token:
-            return []
-        url = f"{self._base}/device/deviceList"
+    async def login_with(self, mode: str, retries: int = API_RETRIES) -> str | None:
+        url = f"{self._base}/user/login?lang={self._lang}"
+        payload = {
+            "password": _hash_password(self._password, mode),
+            "loginSource": self._login_source,
+            "areaCode": self._area_code,
+            "appId": self._app_id,
+            "type": self._type,
+            "userName": self._username,
+        }
+        data = await self._request_json(
+            "POST", url, {"Content-Type": "application/json"}, payload, retries
+        )
+        token = _extract_token(data)
+        if token:
+            self._token = token
+            self._password_mode = mode
+        return token
+
+    async def ensure_token(self) -> str | None:
+        if self._token:
+            return self._token
+        return await self._relogin(None)
+
+    async def _relogin(self, expired: str | None) -> str | None:
+        async with self._login_lock:
+            if self._token and self._token != expired:
+                return self._token
+            self._token = None
+            return await self.login()
+
+    async def _authed_post(
+        self, url: str, payload: dict[str, Any], retries: int = API_RETRIES
+    ) -> dict[str, Any]:
+        token = await self.ensure_token()
+        if not token:
+            raise WarmlinkAuthError("Login failed")
+        try:
+            data = await self._request_json(
+                "POST", url, {"Content-Type": "application/json", "x-token": token}, payload, retries
+            )
+            if not _is_auth_failure(data):
+                return data
+        except WarmlinkAuthError:
+            pass
+        token = await self._relogin(token)
+        if not token:
+            raise WarmlinkAuthError("Login failed")
         data = await self._request_json(
-            "POST",
-            url,
-            {"Content-Type": "application/json", "x-token": self._token},
-            {},
+            "POST", url, {"Content-Type": "application/json", "x-token": token}, payload, retries
         )
+        if _is_auth_failure(data):
+            raise WarmlinkAuthError("Token rejected after re-login")
+        return data
+
+    async def device_list(self) -> list[dict[str, Any]]:
+        url = f"{self._base}/device/deviceList"
+        data = await self._authed_post(url, {})
         obj = data.get("objectResult")
         if isinstance(obj, list):
             return [x for x in obj if isinstance(x, dict)]
         return []
 
     async def get_device_status(self, device_code: str) -> dict[str, Any]:
-        if not self._token:
-            return {}
         url = f"{self._base}/device/getDeviceStatus?lang={self._lang}"
         payload = {"appId": self._app_id, "deviceCode": device_code}
-        data = await self._request_json(
-            "POST",
-            url,
-            {"Content-Type": "application/json", "x-token": self._token},
-            payload,
-        )
+        data = await self._authed_post(url, payload)
         obj = data.get("objectResult")
         return obj if isinstance(obj, dict) else {}
 
     async def get_data_by_code(self, device_code: str, codes: list[str]) -> dict[str, Any]:
-        if not self._token:
-            return {}
         url = f"{self._base}/device/getDataByCode?lang={self._lang}"
         payload = {"deviceCode": device_code, "appId": self._app_id, "protocalCodes": codes}
-        data = await self._request_json(
-            "POST",
-            url,
-            {"Content-Type": "application/json", "x-token": self._token},
-            payload,
-        )
+        data = await self._authed_post(url, payload)
         obj = data.get("objectResult")
         if isinstance(obj, list):
             result: dict[str, Any] = {}
@@ -157,18 +376,16 @@ class WarmlinkApi:
             return result
         return {}
 
-    async def control(self, device_code: str, protocol_code: str, value: str) -> bool:
-        if not self._token:
-            return False
+    async def control_many(self, device_code: str, values: dict[str, str]) -> bool:
+        if not values:
+            return True
         url = f"{self._base}/device/control?lang={self._lang}"
         payload = {
             "appId": self._app_id,
-            "param": [{"deviceCode": device_code, "protocolCode": protocol_code, "value": value}],
+            "param": [
+                {"deviceCode": device_code, "protocolCode": protocol_code, "value": value}
+                for protocol_code, value in values.items()
+            ],
         }
-        data = await self._request_json(
-            "POST",
-            url,
-            {"Content-Type": "application/json", "x-token": self._token},
-            payload,
-        )
-        return bool(data)
+        data = await self._authed_post(url, payload, retries=0)
+        return bool(data) and _is_success(data)
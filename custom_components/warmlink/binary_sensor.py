@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorEntityDescription
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 
 from .const import DOMAIN
 from .coordinator import WarmlinkCoordinator
+from .entity import WarmlinkEntity
 
 
 @dataclass
@@ -21,7 +21,7 @@ BINARY_SENSORS: list[WarmlinkBinaryDescription] = [
 ]
 
 
-class WarmlinkBinarySensor(CoordinatorEntity[WarmlinkCoordinator], BinarySensorEntity):
+class WarmlinkBinarySensor(WarmlinkEntity, BinarySensorEntity):
     entity_description: WarmlinkBinaryDescription
 
     def __init__(
@@ -30,46 +30,35 @@ class WarmlinkBinarySensor(CoordinatorEntity[WarmlinkCoordinator], BinarySensorE
         device_code: str,
         description: WarmlinkBinaryDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, device_code)
         self.entity_description = description
-        self._device_code = device_code
         self._attr_unique_id = f"{device_code}_{description.key}"
 
     @property
     def name(self) -> str:
         return f"Warmlink {self._device_code} {self.entity_description.name}"
 
-    @property
-    def device_info(self) -> dict[str, Any]:
-        device = self.coordinator.data.get("devices", {}).get(self._device_code, {}).get("meta", {})
-        model = device.get("custModel") if device else None
-        return {
-            "identifiers": {(DOMAIN, self._device_code)},
-            "name": device.get("deviceName") if device else self._device_code,
-            "manufacturer": "Warmlink",
-            "model": model,
-            "configuration_url": "https://github.com/00gtw00/homeassistant_warmlink",
-        }
+    def _has_changed(self) -> bool:
+        return bool(self.coordinator.status_changes.get(self._device_code))
 
     @property
     def is_on(self) -> bool | None:
-        status = self.coordinator.data.get("devices", {}).get(self._device_code, {}).get("status", {})
         if self.entity_description.key == "fault":
-            val = status.get("isFault")
-            if val is None:
-                val = status.get("is_fault")
-            return str(val).lower() in ("true", "1", "yes")
+            return self._device_state.fault
         if self.entity_description.key == "online":
-            val = status.get("status")
-            return str(val).upper() == "ONLINE"
+            return self._device_state.online
         return None
 
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:
     coordinator: WarmlinkCoordinator = hass.data[DOMAIN][entry.entry_id]
-    devices = coordinator.data.get("devices", {})
-    entities = []
-    for device_code in devices:
-        for desc in BINARY_SENSORS:
-            entities.append(WarmlinkBinarySensor(coordinator, device_code, desc))
-    async_add_entities(entities)
+
+    @callback
+    def _async_add_devices(device_codes: list[str]) -> None:
+        async_add_entities(
+            WarmlinkBinarySensor(coordinator, device_code, desc)
+            for device_code in device_codes
+            for desc in BINARY_SENSORS
+        )
+
+    entry.async_on_unload(coordinator.async_add_device_listener(_async_add_devices))
@@ -5,45 +5,27 @@ from typing import Any
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import ClimateEntityFeature, HVACMode
 from homeassistant.const import UnitOfTemperature
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 
 from .const import DOMAIN
 from .coordinator import WarmlinkCoordinator
+from .entity import WarmlinkEntity
 
 
-class WarmlinkClimate(CoordinatorEntity[WarmlinkCoordinator], ClimateEntity):
+class WarmlinkClimate(WarmlinkEntity, ClimateEntity):
+    _codes = ("Power", "T01", "R02")
+
     def __init__(self, coordinator: WarmlinkCoordinator, device_code: str) -> None:
-        super().__init__(coordinator)
-        self._device_code = device_code
+        super().__init__(coordinator, device_code)
         self._attr_unique_id = f"{device_code}_climate"
 
     @property
     def name(self) -> str:
         return f"Warmlink {self._device_code}"
 
-    @property
-    def device_info(self) -> dict[str, Any]:
-        device = self._device_meta
-        model = device.get("custModel") if device else None
-        return {
-            "identifiers": {(DOMAIN, self._device_code)},
-            "name": device.get("deviceName") if device else self._device_code,
-            "manufacturer": "Warmlink",
-            "model": model,
-            "configuration_url": "https://github.com/00gtw00/homeassistant_warmlink",
-        }
-
-    @property
-    def _device_meta(self) -> dict[str, Any]:
-        return self.coordinator.data.get("devices", {}).get(self._device_code, {}).get("meta", {})
-
-    @property
-    def _device_values(self) -> dict[str, Any]:
-        return self.coordinator.data.get("devices", {}).get(self._device_code, {}).get("values", {})
-
     @property
     def hvac_mode(self) -> HVACMode:
-        power = self._device_values.get("Power")
+        power = self._device_state.values.get("Power")
         return HVACMode.HEAT if str(power) == "1" else HVACMode.OFF
 
     @property
@@ -56,19 +38,11 @@ class WarmlinkClimate(CoordinatorEntity[WarmlinkCoordinator], ClimateEntity):
 
     @property
     def current_temperature(self) -> float | None:
-        value = self._device_values.get("T01")
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+        return self._device_state.numbers.get("T01")
 
     @property
     def target_temperature(self) -> float | None:
-        value = self._device_values.get("R02")
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+        return self._device_state.numbers.get("R02")
 
     @property
     def min_temp(self) -> float:
@@ -86,27 +60,24 @@ class WarmlinkClimate(CoordinatorEntity[WarmlinkCoordinator], ClimateEntity):
         temperature = kwargs.get("temperature")
         if temperature is None:
             return
-        await self.coordinator.api.control(self._device_code, "R02", str(temperature))
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_control(self._device_code, {"R02": str(temperature)})
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
-        if hvac_mode == HVACMode.OFF:
-            await self.coordinator.api.control(self._device_code, "Power", "0")
-        else:
-            await self.coordinator.api.control(self._device_code, "Power", "1")
-        await self.coordinator.async_request_refresh()
+        power = "0" if hvac_mode == HVACMode.OFF else "1"
+        await self.coordinator.async_control(self._device_code, {"Power": power})
 
     async def async_turn_on(self) -> None:
-        await self.coordinator.api.control(self._device_code, "Power", "1")
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_control(self._device_code, {"Power": "1"})
 
     async def async_turn_off(self) -> None:
-        await self.coordinator.api.control(self._device_code, "Power", "0")
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_control(self._device_code, {"Power": "0"})
 
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:
     coordinator: WarmlinkCoordinator = hass.data[DOMAIN][entry.entry_id]
-    devices = coordinator.data.get("devices", {})
-    entities = [WarmlinkClimate(coordinator, device_code) for device_code in devices]
-    async_add_entities(entities)
+
+    @callback
+    def _async_add_devices(device_codes: list[str]) -> None:
+        async_add_entities([WarmlinkClimate(coordinator, device_code) for device_code in device_codes])
+
+    entry.async_on_unload(coordinator.async_add_device_listener(_async_add_devices))
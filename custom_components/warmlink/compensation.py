@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    COMPENSATION_MAX_SETPOINT,
+    COMPENSATION_MIN_INTERVAL,
+    COMPENSATION_MIN_SETPOINT,
+    COMPENSATION_ROOM,
+    COMPENSATION_STEP,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import WarmlinkCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPENSATION_CODES = ("Power", "R02", "T04", "compensate_slope", "compensate_offset")
+
+
+def parse_curve(value: str) -> list[tuple[float, float]]:
+    points: list[tuple[float, float]] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        outside, _, flow = item.partition(":")
+        try:
+            points.append((float(outside), float(flow)))
+        except ValueError as err:
+            raise ValueError(f"Invalid curve point {item!r}") from err
+    return sorted(points)
+
+
+def curve_setpoint(points: list[tuple[float, float]], outside: float) -> float | None:
+    if not points:
+        return None
+    if outside <= points[0][0]:
+        return points[0][1]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if outside <= x1:
+            return y0 + (y1 - y0) * (outside - x0) / (x1 - x0)
+    return points[-1][1]
+
+
+def slope_setpoint(slope: float, offset: float, outside: float) -> float:
+    return COMPENSATION_ROOM + offset + slope * (COMPENSATION_ROOM - outside)
+
+
+class WarmlinkCompensation:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: WarmlinkCoordinator,
+        curve: list[tuple[float, float]],
+        hysteresis: float,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._curve = curve
+        self._hysteresis = hysteresis
+        self._last_write: dict[str, float] = {}
+        self._writing: set[str] = set()
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        self._unsubscribers.extend(
+            (
+                self._coordinator.async_add_device_listener(self._async_track_devices),
+                self._coordinator.async_add_update_listener(self.async_evaluate),
+            )
+        )
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+
+    @callback
+    def _async_track_devices(self, device_codes: list[str]) -> None:
+        for device_code in device_codes:
+            self._unsubscribers.append(
+                self._coordinator.async_register_codes(device_code, COMPENSATION_CODES)
+            )
+
+    def setpoint(self, numbers: dict[str, float | None]) -> float | None:
+        outside = numbers.get("T04")
+        if outside is None:
+            return None
+        if self._curve:
+            target = curve_setpoint(self._curve, outside)
+        else:
+            slope, offset = numbers.get("compensate_slope"), numbers.get("compensate_offset")
+            if slope is None or offset is None:
+                return None
+            target = slope_setpoint(slope, offset, outside)
+        target = min(max(target, COMPENSATION_MIN_SETPOINT), COMPENSATION_MAX_SETPOINT)
+        return round(target / COMPENSATION_STEP) * COMPENSATION_STEP
+
+    @callback
+    def async_evaluate(self) -> None:
+        now = time.monotonic()
+        for device_code in self._coordinator.inventory:
+            state = self._coordinator.devices.get(device_code)
+            if state is None or device_code in self._writing or not state.online:
+                continue
+            if not self._coordinator.is_fresh(device_code, COMPENSATION_CODES):
+                continue
+            last = self._last_write.get(device_code)
+            if last is not None and now - last < COMPENSATION_MIN_INTERVAL:
+                continue
+            if str(state.values.get("Power", "1")) != "1":
+                continue
+            target = self.setpoint(state.numbers)
+            current = state.numbers.get("R02")
+            if target is None or (current is not None and abs(target - current) < self._hysteresis):
+                continue
+            self._last_write[device_code] = now
+            self._writing.add(device_code)
+            self._hass.async_create_background_task(
+                self._async_write(device_code, target), f"{DOMAIN} compensation {device_code}"
+            )
+
+    async def _async_write(self, device_code: str, target: float) -> None:
+        try:
+            _LOGGER.debug("Compensation setpoint for %s is %s", device_code, target)
+            await self._coordinator.async_control(device_code, {"R02": f"{target:g}"})
+        except HomeAssistantError as err:
+            _LOGGER.warning("Writing compensated setpoint to %s failed: %s", device_code, err)
+        finally:
+            self._writing.discard(device_code)
@@ -1,35 +1,147 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .api import PASSWORD_MODES, CircuitBreaker, WarmlinkApi, WarmlinkConnectionError, WarmlinkError
+from .compensation import parse_curve
 from .const import (
     CONF_APP_ID,
     CONF_AREA_CODE,
+    CONF_BACKFILL,
     CONF_BASE,
+    CONF_COMPENSATION,
+    CONF_COMPENSATION_CURVE,
+    CONF_COMPENSATION_HYSTERESIS,
+    CONF_EXTRA_CODES,
+    CONF_HISTORY,
+    CONF_INVENTORY_INTERVAL,
     CONF_LANG,
+    CONF_LOCAL_DEVICE,
+    CONF_LOCAL_HOST,
+    CONF_LOCAL_PORT,
+    CONF_LOCAL_REGISTERS,
+    CONF_LOCAL_SLAVE,
     CONF_LOGIN_SOURCE,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_PARALLEL,
+    CONF_MAX_STALENESS,
+    CONF_METRICS,
+    CONF_MIN_INTERVAL,
+    CONF_PASSWORD_MODE,
+    CONF_PUSH_TOPIC,
+    CONF_SHARD_SIZE,
+    CONF_STATUS_INTERVAL,
+    CONF_SUPPLY_VOLTAGE,
     CONF_TYPE,
     CONF_UPDATE_INTERVAL,
     DEFAULT_APP_ID,
     DEFAULT_AREA_CODE,
     DEFAULT_BASE,
+    DEFAULT_COMPENSATION_HYSTERESIS,
+    DEFAULT_INVENTORY_INTERVAL,
     DEFAULT_LANG,
+    DEFAULT_LOCAL_PORT,
+    DEFAULT_LOCAL_SLAVE,
     DEFAULT_LOGIN_SOURCE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SHARD_SIZE,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_SUPPLY_VOLTAGE,
     DEFAULT_TYPE,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    PROBE_TIMEOUT,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _async_probe(hass: HomeAssistant, data: dict[str, Any]) -> tuple[str, str]:
+    session = async_get_clientsession(hass)
+    bases = [base.strip() for base in data[CONF_BASE].split(",") if base.strip()]
+    tasks: dict[asyncio.Future[str | None], tuple[str, str]] = {}
+    for base in bases:
+        api = WarmlinkApi(
+            session=session,
+            username=data["username"],
+            password=data["password"],
+            base=base,
+            lang=data[CONF_LANG],
+            login_source=data[CONF_LOGIN_SOURCE],
+            area_code=data[CONF_AREA_CODE],
+            app_id=data[CONF_APP_ID],
+            typ=data[CONF_TYPE],
+            breaker=CircuitBreaker(),
+        )
+        for mode in PASSWORD_MODES:
+            tasks[asyncio.ensure_future(api.login_with(mode, retries=0))] = (base, mode)
+    reachable = False
+    pending = set(tasks)
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        token = task.result()
+                    except WarmlinkConnectionError as err:
+                        _LOGGER.debug("Probe of %s failed: %s", tasks[task][0], err)
+                        continue
+                    except WarmlinkError:
+                        token = None
+                    reachable = True
+                    if token:
+                        return tasks[task]
+    except TimeoutError:
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
+    raise InvalidAuth if reachable else CannotConnect
+
+
+class CannotConnect(Exception):
+    pass
+
+
+class InvalidAuth(Exception):
+    pass
+
 
 class WarmlinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> WarmlinkOptionsFlow:
+        return WarmlinkOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title=user_input["username"], data=user_input)
+            await self.async_set_unique_id(user_input["username"].lower())
+            self._abort_if_unique_id_configured()
+            try:
+                base, mode = await _async_probe(self.hass, user_input)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            else:
+                return self.async_create_entry(
+                    title=user_input["username"],
+                    data={**user_input, CONF_BASE: base, CONF_PASSWORD_MODE: mode},
+                )
 
         schema = vol.Schema(
             {
@@ -41,7 +153,90 @@ class WarmlinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_AREA_CODE, default=DEFAULT_AREA_CODE): str,
                 vol.Optional(CONF_APP_ID, default=DEFAULT_APP_ID): str,
                 vol.Optional(CONF_TYPE, default=DEFAULT_TYPE): str,
-                vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): int,
             }
         )
-        return self.async_show_form(step_id="user", data_schema=schema)
+        if user_input is not None:
+            schema = self.add_suggested_values_to_schema(schema, user_input)
+        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+
+class WarmlinkOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None):
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                parse_curve(user_input.get(CONF_COMPENSATION_CURVE, ""))
+            except ValueError:
+                errors[CONF_COMPENSATION_CURVE] = "invalid_curve"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        current = {**self._entry.data, **self._entry.options, **(user_input or {})}
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_UPDATE_INTERVAL,
+                    default=current.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+                ): int,
+                vol.Optional(
+                    CONF_MIN_INTERVAL, default=current.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+                ): int,
+                vol.Optional(
+                    CONF_MAX_INTERVAL, default=current.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+                ): int,
+                vol.Optional(
+                    CONF_MAX_PARALLEL, default=current.get(CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL)
+                ): int,
+                vol.Optional(
+                    CONF_STATUS_INTERVAL,
+                    default=current.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL),
+                ): int,
+                vol.Optional(
+                    CONF_INVENTORY_INTERVAL,
+                    default=current.get(CONF_INVENTORY_INTERVAL, DEFAULT_INVENTORY_INTERVAL),
+                ): int,
+                vol.Optional(CONF_EXTRA_CODES, default=current.get(CONF_EXTRA_CODES, "")): str,
+                vol.Optional(
+                    CONF_MAX_STALENESS,
+                    default=current.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+                ): int,
+                vol.Optional(
+                    CONF_SUPPLY_VOLTAGE,
+                    default=current.get(CONF_SUPPLY_VOLTAGE, DEFAULT_SUPPLY_VOLTAGE),
+                ): int,
+                vol.Optional(CONF_METRICS, default=current.get(CONF_METRICS, False)): bool,
+                vol.Optional(CONF_BACKFILL, default=current.get(CONF_BACKFILL, False)): bool,
+                vol.Optional(CONF_LOCAL_DEVICE, default=current.get(CONF_LOCAL_DEVICE, "")): str,
+                vol.Optional(CONF_LOCAL_HOST, default=current.get(CONF_LOCAL_HOST, "")): str,
+                vol.Optional(
+                    CONF_LOCAL_PORT, default=current.get(CONF_LOCAL_PORT, DEFAULT_LOCAL_PORT)
+                ): int,
+                vol.Optional(
+                    CONF_LOCAL_SLAVE, default=current.get(CONF_LOCAL_SLAVE, DEFAULT_LOCAL_SLAVE)
+                ): int,
+                vol.Optional(
+                    CONF_LOCAL_REGISTERS, default=current.get(CONF_LOCAL_REGISTERS, "")
+                ): str,
+                vol.Optional(CONF_PUSH_TOPIC, default=current.get(CONF_PUSH_TOPIC, "")): str,
+                vol.Optional(
+                    CONF_SHARD_SIZE, default=current.get(CONF_SHARD_SIZE, DEFAULT_SHARD_SIZE)
+                ): int,
+                vol.Optional(CONF_HISTORY, default=current.get(CONF_HISTORY, False)): bool,
+                vol.Optional(
+                    CONF_COMPENSATION, default=current.get(CONF_COMPENSATION, False)
+                ): bool,
+                vol.Optional(
+                    CONF_COMPENSATION_CURVE, default=current.get(CONF_COMPENSATION_CURVE, "")
+                ): str,
+                vol.Optional(
+                    CONF_COMPENSATION_HYSTERESIS,
+                    default=current.get(
+                        CONF_COMPENSATION_HYSTERESIS, DEFAULT_COMPENSATION_HYSTERESIS
+                    ),
+                ): vol.Coerce(float),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
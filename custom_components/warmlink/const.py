@@ -1,4 +1,8 @@
 DOMAIN = "warmlink"
+DATA_HUBS = "hubs"
+DATA_HISTORY = "history"
+DATA_PLATFORMS = "platforms"
+DATA_OPTIONS = "options"
 
 DEFAULT_BASE = "https://cloud.linked-go.com:449/crmservice/api/app"
 DEFAULT_LANG = "en"
@@ -13,10 +17,104 @@ CONF_LOGIN_SOURCE = "login_source"
 CONF_AREA_CODE = "area_code"
 CONF_APP_ID = "app_id"
 CONF_TYPE = "type"
+CONF_PASSWORD_MODE = "password_mode"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MAX_PARALLEL = "max_parallel"
+CONF_STATUS_INTERVAL = "status_interval"
+CONF_INVENTORY_INTERVAL = "inventory_interval"
+CONF_EXTRA_CODES = "extra_codes"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_METRICS = "metrics"
+CONF_BACKFILL = "backfill_statistics"
+CONF_SUPPLY_VOLTAGE = "supply_voltage"
+CONF_LOCAL_DEVICE = "local_device"
+CONF_LOCAL_HOST = "local_host"
+CONF_LOCAL_PORT = "local_port"
+CONF_LOCAL_SLAVE = "local_slave"
+CONF_LOCAL_REGISTERS = "local_registers"
+CONF_PUSH_TOPIC = "push_topic"
+CONF_SHARD_SIZE = "shard_size"
+CONF_HISTORY = "history"
+CONF_COMPENSATION = "compensation"
+CONF_COMPENSATION_CURVE = "compensation_curve"
+CONF_COMPENSATION_HYSTERESIS = "compensation_hysteresis"
 
 API_TIMEOUT = 15
+API_RETRIES = 2
+API_RETRY_DELAY = 1.0
+PROBE_TIMEOUT = 20
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60
+RATE_LIMIT_PER_SECOND = 5.0
+RATE_LIMIT_BURST = 10
+# Golden-ratio step that spreads entry and shard poll phases evenly over the interval.
+PHASE_STEP = 0.618033988749895
 DEFAULT_UPDATE_INTERVAL = 30
+DEFAULT_MAX_PARALLEL = 4
+DEFAULT_STATUS_INTERVAL = 120
+DEFAULT_INVENTORY_INTERVAL = 3600
+DEFAULT_MIN_INTERVAL = 10
+DEFAULT_MAX_INTERVAL = 300
+DEFAULT_MAX_STALENESS = 900
+DEFAULT_SUPPLY_VOLTAGE = 230
+DEFAULT_LOCAL_PORT = 502
+DEFAULT_LOCAL_SLAVE = 1
+DEFAULT_SHARD_SIZE = 0
+DEFAULT_COMPENSATION_HYSTERESIS = 1.0
+MODBUS_MAX_READ = 64
+
+# Push mode: polling drops to a reconciliation cadence while messages arrive,
+# and falls back to normal polling after PUSH_TIMEOUT seconds of silence.
+PUSH_RECONCILE_INTERVAL = 600
+PUSH_TIMEOUT = 300
+
+# Local telemetry history: raw samples per code for about half a day at the
+# default interval, plus two weeks of 5-minute min/mean/max buckets.
+HISTORY_RAW_SIZE = 1440
+HISTORY_BUCKET = 300
+HISTORY_AGGREGATE_SIZE = 4032
+HISTORY_SAVE_INTERVAL = 900
+HISTORY_DEFAULT_WINDOW = 86400
+SERVICE_QUERY_HISTORY = "query_history"
+SERVICE_BULK_CONTROL = "bulk_control"
+SERVICE_APPLY_SCHEDULE = "apply_schedule"
+SERVICE_REFRESH_DEVICES = "refresh_devices"
+BULK_WAVE_SIZE = 10
+
+# Weather compensation: flow setpoint = room + offset + slope * (room - outside),
+# or a user curve of outside:flow points, clamped and rounded before writing R02.
+COMPENSATION_ROOM = 20.0
+COMPENSATION_MIN_SETPOINT = 20.0
+COMPENSATION_MAX_SETPOINT = 60.0
+COMPENSATION_STEP = 0.5
+COMPENSATION_MIN_INTERVAL = 900
+CONTROL_DEBOUNCE = 0.5
+CONTROL_TIMEOUT = 30
+CONTROL_CONFIRM_DELAY = 2.0
+CONTROL_CONFIRM_ATTEMPTS = 3
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Telemetry buffered locally and imported as hourly long-term statistics.
+BACKFILL_CODES = {"T01": "°C", "T02": "°C", "T04": "°C", "InputCurrent1": "A"}
+BACKFILL_BUFFER_SIZE = 2880
+BACKFILL_BATCH_SIZE = 24
+
+# Derived heat output: water carries 1.163 kWh per m3 per kelvin. Energy is not
+# integrated across gaps longer than DERIVED_MAX_GAP seconds; running COP is
+# taken over the last DERIVED_WINDOW samples.
+WATER_KWH_PER_M3_K = 1.163
+DERIVED_MAX_GAP = 900
+DERIVED_WINDOW = 120
+DERIVED_MIN_ELECTRIC = 0.05
+
+# Adaptive polling: devices are polled at the floor interval for this long
+# after a write, and whenever T01 moves by at least this much between polls.
+ADAPTIVE_TRANSIENT_WINDOW = 120
+ADAPTIVE_RAPID_DELTA = 1.0
 
 DEFAULT_CODES = [
     "Power",
@@ -34,3 +132,7 @@ DEFAULT_CODES = [
     "compensate_slope",
     "compensate_offset",
 ]
+
+# Codes each model is known to report, keyed on meta["custModel"]. Requested
+# codes are narrowed to the profile; unknown models fall back to DEFAULT_CODES.
+MODEL_CODE_PROFILES: dict[str, list[str]] = {}
@@ -1,21 +1,101 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, TypeVar
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import WarmlinkApi
-from .const import DEFAULT_CODES, DEFAULT_UPDATE_INTERVAL, DOMAIN
+from .api import WarmlinkApi, WarmlinkError, WarmlinkTimeoutError
+from .const import (
+    ADAPTIVE_RAPID_DELTA,
+    ADAPTIVE_TRANSIENT_WINDOW,
+    CONTROL_CONFIRM_ATTEMPTS,
+    CONTROL_CONFIRM_DELAY,
+    CONTROL_DEBOUNCE,
+    CONTROL_TIMEOUT,
+    DEFAULT_CODES,
+    DEFAULT_INVENTORY_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SHARD_SIZE,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_SUPPLY_VOLTAGE,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    MODEL_CODE_PROFILES,
+    PHASE_STEP,
+    PUSH_RECONCILE_INTERVAL,
+    STORAGE_SAVE_DELAY,
+)
+from .derived import DERIVED_INPUT_CODES, DerivedEnergy, electric_power, heat_power
+from .device import WarmlinkDevice, parse_float
+from .metrics import WarmlinkMetrics
+from .transport import WarmlinkTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+_POLL_SLACK = 1.0
+
+
+def _device_code(device: dict[str, Any]) -> str | None:
+    return (
+        device.get("deviceCode")
+        or device.get("deviceName")
+        or device.get("device_code")
+        or device.get("device_name")
+    )
+
+
+def _is_transient(old: dict[str, Any], new: dict[str, Any]) -> bool:
+    if old.get("Power") != new.get("Power") or old.get("R02") != new.get("R02"):
+        return True
+    before, after = parse_float(old.get("T01")), parse_float(new.get("T01"))
+    return before is not None and after is not None and abs(after - before) >= ADAPTIVE_RAPID_DELTA
+
+
+def _same_value(reported: Any, written: str) -> bool:
+    before, after = parse_float(reported), parse_float(written)
+    if before is not None and after is not None:
+        return abs(before - after) < 1e-6
+    return str(reported) == written
+
+
+def _changed_keys(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
 
 class WarmlinkCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(
-        self, hass: HomeAssistant, api: WarmlinkApi, update_interval: int = DEFAULT_UPDATE_INTERVAL
+        self,
+        hass: HomeAssistant,
+        api: WarmlinkApi,
+        update_interval: int = DEFAULT_UPDATE_INTERVAL,
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+        min_interval: int = DEFAULT_MIN_INTERVAL,
+        max_interval: int = DEFAULT_MAX_INTERVAL,
+        status_interval: int = DEFAULT_STATUS_INTERVAL,
+        inventory_interval: int = DEFAULT_INVENTORY_INTERVAL,
+        extra_codes: list[str] | None = None,
+        max_staleness: int = DEFAULT_MAX_STALENESS,
+        store: Store | None = None,
+        phase: float = 0.0,
+        supply_voltage: float = DEFAULT_SUPPLY_VOLTAGE,
+        local_transports: dict[str, WarmlinkTransport] | None = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
     ) -> None:
         super().__init__(
             hass,
@@ -24,29 +104,783 @@ class WarmlinkCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=update_interval),
         )
         self.api = api
+        self._semaphore = asyncio.Semaphore(max(1, max_parallel))
+        self._base_interval = float(update_interval)
+        self._min_interval = float(min(min_interval, update_interval))
+        self._max_interval = float(max(max_interval, update_interval))
+        self._device_interval: dict[str, float] = {}
+        self._next_poll: dict[str, float] = {}
+        self._transient_until: dict[str, float] = {}
+        self._status_interval = status_interval
+        self._inventory_interval = inventory_interval
+        self._inventory: dict[str, dict[str, Any]] = {}
+        self._inventory_at: float | None = None
+        self._status_at: dict[str, float] = {}
+        self._pending_writes: dict[str, dict[str, str]] = {}
+        self._write_results: dict[str, asyncio.Future[bool]] = {}
+        self._write_locks: dict[str, asyncio.Lock] = {}
+        self._flush_handles: dict[str, CALLBACK_TYPE] = {}
+        self._write_tasks: set[asyncio.Task[None]] = set()
+        self.write_states: dict[str, dict[str, str]] = {}
+        self._optimistic: dict[str, dict[str, tuple[Any, str]]] = {}
+        self._extra_codes = list(extra_codes or [])
+        self._entity_codes: dict[str, Counter[str]] = {}
+        self._max_staleness = max_staleness
+        self._store = store
+        self._phase = phase
+        self._supply_voltage = supply_voltage
+        self._energy: dict[str, DerivedEnergy] = {}
+        self._local_transports = dict(local_transports or {})
+        self.push_devices: set[str] = set()
+        self._shard_size = max(0, shard_size)
+        self._shards: list[WarmlinkShard] = []
+        self._shard_of: dict[str, WarmlinkShard] = {}
+        self._announced: list[str] = []
+        self._device_listeners: list[Callable[[list[str]], None]] = []
+        self._update_listeners: list[Callable[[], None]] = []
+        self._unsub_announce: CALLBACK_TYPE | None = None
+        self.devices: dict[str, WarmlinkDevice] = {}
+        self.changes: dict[str, set[str]] = {}
+        self.status_changes: dict[str, set[str]] = {}
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        if not self.api.token:
-            token = await self.api.login()
-            if not token:
-                raise UpdateFailed("Login failed")
-
-        devices = await self.api.device_list()
-        result: dict[str, Any] = {"devices": {}}
-        for device in devices:
-            code = (
-                device.get("deviceCode")
-                or device.get("deviceName")
-                or device.get("device_code")
-                or device.get("device_name")
+    async def async_restore_snapshot(self) -> bool:
+        if self._store is None:
+            return False
+        snapshot = await self._store.async_load()
+        devices = snapshot.get("devices") if isinstance(snapshot, dict) else None
+        if not isinstance(devices, dict) or not devices:
+            return False
+        self._inventory = {code: item.get("meta", {}) for code, item in devices.items()}
+        for code, totals in (snapshot.get("energy") or {}).items():
+            self._energy[code] = DerivedEnergy(*totals)
+        if self._shard_size:
+            self._async_assign_shards()
+        restored = {code: {**item, "stale": True} for code, item in devices.items()}
+        self._track_changes(restored)
+        self.async_set_updated_data({"devices": restored})
+        return True
+
+    def device(self, device_code: str) -> WarmlinkDevice:
+        state = self.devices.get(device_code)
+        if state is None:
+            state = self.devices[device_code] = WarmlinkDevice(device_code)
+        return state
+
+    @callback
+    def async_set_options(
+        self, update_interval: int, max_parallel: int, min_interval: int, max_interval: int
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max(1, max_parallel))
+        self._base_interval = float(update_interval)
+        self._min_interval = float(min(min_interval, update_interval))
+        self._max_interval = float(max(max_interval, update_interval))
+        self._device_interval.clear()
+        self._next_poll.clear()
+        for coordinator in [self, *self._shards]:
+            self.hass.async_create_task(coordinator.async_request_refresh())
+
+    def shard_for(self, device_code: str) -> WarmlinkShard | WarmlinkCoordinator:
+        return self._shard_of.get(device_code, self)
+
+    @property
+    def inventory(self) -> list[str]:
+        return list(self._inventory)
+
+    def is_fresh(self, device_code: str, codes: tuple[str, ...] = ()) -> bool:
+        state = self.devices.get(device_code)
+        return state is not None and state.is_fresh(codes, self._max_staleness)
+
+    @callback
+    def async_add_device_listener(self, listener: Callable[[list[str]], None]) -> CALLBACK_TYPE:
+        if self._announced:
+            listener(list(self._announced))
+        self._device_listeners.append(listener)
+        if self._unsub_announce is None:
+            self._unsub_announce = self.async_add_listener(self._async_announce_devices)
+        self._async_announce_devices()
+
+        @callback
+        def _async_remove() -> None:
+            self._device_listeners.remove(listener)
+            if not self._device_listeners and self._unsub_announce is not None:
+                self._unsub_announce()
+                self._unsub_announce = None
+
+        return _async_remove
+
+    # Unlike async_add_listener, these also fire when a single shard publishes and
+    # do not keep the coordinator polling on their own.
+    @callback
+    def async_add_update_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        self._update_listeners.append(listener)
+
+        @callback
+        def _async_remove() -> None:
+            self._update_listeners.remove(listener)
+
+        return _async_remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        super().async_update_listeners()
+        self._async_notify_update()
+
+    @callback
+    def _async_notify_update(self) -> None:
+        for listener in list(self._update_listeners):
+            listener()
+
+    @callback
+    def _async_announce_devices(self) -> None:
+        known = set(self._announced)
+        new = [code for code in (self.data or {}).get("devices", {}) if code not in known]
+        if not new:
+            return
+        self._announced.extend(new)
+        for listener in list(self._device_listeners):
+            listener(new)
+
+    @callback
+    def async_register_codes(self, device_code: str, codes: tuple[str, ...]) -> CALLBACK_TYPE:
+        counter = self._entity_codes.setdefault(device_code, Counter())
+        counter.update(codes)
+
+        @callback
+        def _async_unregister() -> None:
+            counter.subtract(codes)
+            for code in codes:
+                if counter[code] <= 0:
+                    del counter[code]
+
+        return _async_unregister
+
+    def codes_for(self, device_code: str) -> list[str]:
+        model = self._inventory.get(device_code, {}).get("custModel")
+        profile = MODEL_CODE_PROFILES.get(model) if model else None
+        registered = self._entity_codes.get(device_code)
+        if registered:
+            codes = [code for code in registered if profile is None or code in profile]
+        else:
+            codes = list(profile or DEFAULT_CODES)
+        codes.extend(code for code in self._extra_codes if code not in codes)
+        return codes
+
+    async def async_request_inventory_refresh(self) -> None:
+        self._inventory_at = None
+        await self.async_request_refresh()
+
+    async def _async_refresh_inventory(self, now: float) -> None:
+        devices: dict[str, dict[str, Any]] = {}
+        try:
+            listed = await self.api.device_list()
+        except WarmlinkError as err:
+            if not self._inventory:
+                raise UpdateFailed(f"Device list failed: {err}") from err
+            _LOGGER.warning("Device list failed, keeping cached inventory: %s", err)
+            return
+        for device in listed:
+            code = _device_code(device)
+            if code:
+                devices[code] = device
+        if not devices and self._inventory:
+            _LOGGER.debug("Empty device list returned, keeping cached inventory")
+            return
+        self._inventory = devices
+        self._inventory_at = now
+        for tracked in (self._status_at, self._device_interval, self._next_poll):
+            for code in list(tracked):
+                if code not in devices:
+                    del tracked[code]
+
+    async def async_control(self, device_code: str, values: dict[str, str]) -> bool:
+        now = time.monotonic()
+        self._transient_until[device_code] = now + ADAPTIVE_TRANSIENT_WINDOW
+        self._next_poll[device_code] = now + self._min_interval
+        self._async_apply_optimistic(device_code, values)
+        self._async_set_write_state(device_code, values, "pending")
+        self._pending_writes.setdefault(device_code, {}).update(values)
+        result = self._write_results.get(device_code)
+        if result is None:
+            result = self.hass.loop.create_future()
+            self._write_results[device_code] = result
+            self._flush_handles[device_code] = async_call_later(
+                self.hass, CONTROL_DEBOUNCE, partial(self._async_start_flush, device_code)
+            )
+        try:
+            return await asyncio.shield(result)
+        except WarmlinkError as err:
+            raise HomeAssistantError(f"Control of {device_code} failed: {err}") from err
+
+    @callback
+    def _async_start_flush(self, device_code: str, _now: datetime) -> None:
+        del self._flush_handles[device_code]
+        task = self.hass.async_create_background_task(
+            self._async_flush_writes(device_code), f"{DOMAIN} write {device_code}"
+        )
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+
+    async def _async_flush_writes(self, device_code: str) -> None:
+        lock = self._write_locks.setdefault(device_code, asyncio.Lock())
+        async with lock:
+            values = self._pending_writes.pop(device_code, {})
+            result = self._write_results.pop(device_code)
+            try:
+                ok = await self._async_write_batch(device_code, values)
+            except asyncio.CancelledError:
+                result.cancel()
+                raise
+            except Exception as err:
+                result.set_exception(err)
+                return
+            result.set_result(ok)
+            if ok:
+                await self._async_confirm_writes(device_code, values)
+
+    async def _async_write_batch(self, device_code: str, values: dict[str, str]) -> bool:
+        ok = False
+        try:
+            async with asyncio.timeout(CONTROL_TIMEOUT):
+                ok = await self._async_write(device_code, values)
+        except TimeoutError as err:
+            raise WarmlinkTimeoutError(f"Write timed out after {CONTROL_TIMEOUT}s") from err
+        finally:
+            written = self._pop_optimistic(device_code, values)
+            if not ok:
+                self._async_rollback(device_code, written)
+                self._async_set_write_state(device_code, values, "failed")
+        return ok
+
+    async def async_write_values(self, device_code: str, values: dict[str, str]) -> bool:
+        self._transient_until[device_code] = time.monotonic() + ADAPTIVE_TRANSIENT_WINDOW
+        self._async_apply_optimistic(device_code, values)
+        self._async_set_write_state(device_code, values, "pending")
+        async with self._write_locks.setdefault(device_code, asyncio.Lock()):
+            return await self._async_write_batch(device_code, values)
+
+    async def async_reconcile(self, written: dict[str, dict[str, str]]) -> dict[str, bool]:
+        coordinators: dict[int, WarmlinkShard | WarmlinkCoordinator] = {}
+        for device_code in written:
+            self._next_poll[device_code] = 0.0
+            coordinator = self.shard_for(device_code)
+            coordinators[id(coordinator)] = coordinator
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators.values()))
+        confirmed: dict[str, bool] = {}
+        for device_code, values in written.items():
+            reported = self._device(device_code).get("values", {})
+            matched = {code for code, value in values.items() if _same_value(reported.get(code), value)}
+            self._async_set_write_state(device_code, matched, "confirmed")
+            self._async_set_write_state(device_code, values.keys() - matched, "failed")
+            confirmed[device_code] = len(matched) == len(values)
+        return confirmed
+
+    async def _async_confirm_writes(self, device_code: str, values: dict[str, str]) -> None:
+        remaining = dict(values)
+        for _ in range(CONTROL_CONFIRM_ATTEMPTS):
+            superseded = self._pending_writes.get(device_code, {})
+            remaining = {code: value for code, value in remaining.items() if code not in superseded}
+            if not remaining:
+                return
+            await asyncio.sleep(CONTROL_CONFIRM_DELAY)
+            try:
+                async with asyncio.timeout(CONTROL_TIMEOUT):
+                    reported = await self._async_read_values(device_code, list(remaining))
+            except (TimeoutError, WarmlinkError) as err:
+                _LOGGER.debug("Confirming writes on %s failed: %s", device_code, err)
+                continue
+            device = self._device(device_code)
+            if device and reported:
+                wall = time.time()
+                item = {
+                    **device,
+                    "values": {**device.get("values", {}), **reported},
+                    "updated": {**device.get("updated", {}), **dict.fromkeys(reported, wall)},
+                }
+                self._async_set_device(device_code, self._with_optimistic(device_code, item))
+            confirmed = [
+                code for code, value in remaining.items() if _same_value(reported.get(code), value)
+            ]
+            self._async_set_write_state(device_code, confirmed, "confirmed")
+            for code in confirmed:
+                del remaining[code]
+        if remaining:
+            _LOGGER.debug("%s did not confirm %s", device_code, remaining)
+            self._async_set_write_state(device_code, remaining, "failed")
+
+    @callback
+    def _async_set_write_state(self, device_code: str, codes: Iterable[str], state: str) -> None:
+        codes = set(codes)
+        if not codes:
+            return
+        states = self.write_states.setdefault(device_code, {})
+        for code in codes:
+            states[code] = state
+        self.changes = {device_code: codes}
+        self.status_changes = {}
+        self.shard_for(device_code).async_update_listeners()
+
+    def _device(self, device_code: str) -> dict[str, Any]:
+        return (self.data or {}).get("devices", {}).get(device_code, {})
+
+    def _track_changes(self, devices: dict[str, dict[str, Any]]) -> None:
+        published = (self.data or {}).get("devices", {})
+        self.changes = {}
+        self.status_changes = {}
+        for code, item in devices.items():
+            last = published.get(code, {})
+            self.changes[code] = _changed_keys(last.get("values", {}), item.get("values", {}))
+            self.status_changes[code] = _changed_keys(
+                last.get("status", {}), item.get("status", {})
             )
-            if not code:
-                continue
-            status = await self.api.get_device_status(code)
-            values = await self.api.get_data_by_code(code, DEFAULT_CODES)
-            result["devices"][code] = {
-                "meta": device,
-                "status": status,
-                "values": values,
+            state = self.device(code)
+            state.update(item)
+            self._update_derived(state)
+
+    def _update_derived(self, state: WarmlinkDevice) -> None:
+        energy = self._energy.get(state.code)
+        if energy is None:
+            energy = self._energy[state.code] = DerivedEnergy()
+        heat = heat_power(state.numbers)
+        electric = electric_power(state.numbers, self._supply_voltage)
+        stamps = [state.updated[code] for code in DERIVED_INPUT_CODES if code in state.updated]
+        if stamps:
+            energy.add(max(stamps), heat, electric)
+        state.derived = energy.values(heat, electric)
+
+    @callback
+    def _async_set_device(self, device_code: str, item: dict[str, Any]) -> None:
+        if self.data is None:
+            return
+        self._track_changes({device_code: item})
+        self.data = {**self.data, "devices": {**self.data.get("devices", {}), device_code: item}}
+        self.shard_for(device_code).async_update_listeners()
+
+    def _with_optimistic(self, device_code: str, item: dict[str, Any]) -> dict[str, Any]:
+        optimistic = self._optimistic.get(device_code)
+        if not optimistic:
+            return item
+        values = {code: value for code, (_, value) in optimistic.items()}
+        return {**item, "values": {**item.get("values", {}), **values}}
+
+    @callback
+    def _async_apply_optimistic(self, device_code: str, values: dict[str, str]) -> None:
+        device = self._device(device_code)
+        if not device:
+            return
+        optimistic = self._optimistic.setdefault(device_code, {})
+        current = device.get("values", {})
+        for code, value in values.items():
+            original = optimistic[code][0] if code in optimistic else current.get(code)
+            optimistic[code] = (original, value)
+        self._async_set_device(device_code, self._with_optimistic(device_code, device))
+
+    def _pop_optimistic(
+        self, device_code: str, values: dict[str, str]
+    ) -> dict[str, tuple[Any, str]]:
+        optimistic = self._optimistic.get(device_code, {})
+        written = {
+            code: optimistic.pop(code)
+            for code, value in values.items()
+            if code in optimistic and optimistic[code][1] == value
+        }
+        if not optimistic:
+            self._optimistic.pop(device_code, None)
+        return written
+
+    @callback
+    def _async_rollback(self, device_code: str, written: dict[str, tuple[Any, str]]) -> None:
+        device = self._device(device_code)
+        if not device or not written:
+            return
+        restored = {code: original for code, (original, _) in written.items()}
+        item = {**device, "values": {**device.get("values", {}), **restored}}
+        self._async_set_device(device_code, self._with_optimistic(device_code, item))
+
+    @callback
+    def async_end_push(self, device_codes: Iterable[str]) -> None:
+        coordinators: dict[int, WarmlinkShard | WarmlinkCoordinator] = {}
+        for device_code in device_codes:
+            if device_code not in self.push_devices:
+                continue
+            self.push_devices.discard(device_code)
+            self._next_poll[device_code] = 0.0
+            coordinator = self.shard_for(device_code)
+            coordinators[id(coordinator)] = coordinator
+        for coordinator in coordinators.values():
+            self.hass.async_create_task(coordinator.async_request_refresh())
+
+    @callback
+    def async_apply_push(self, device_code: str, values: dict[str, Any]) -> bool:
+        device = self._device(device_code)
+        if not device or not values:
+            return False
+        self.push_devices.add(device_code)
+        wall = time.time()
+        item = {
+            **device,
+            "values": {**device.get("values", {}), **values},
+            "updated": {**device.get("updated", {}), **dict.fromkeys(values, wall)},
+            "updated_at": wall,
+            "stale": False,
+        }
+        self._async_set_device(device_code, self._with_optimistic(device_code, item))
+        return True
+
+    def _schedule_device(
+        self,
+        device_code: str,
+        previous: dict[str, Any],
+        item: dict[str, Any],
+        failed: bool,
+        now: float,
+    ) -> None:
+        last = max(self._device_interval.get(device_code, self._base_interval), self._base_interval)
+        online = str(item.get("status", {}).get("status", "ONLINE")).upper() == "ONLINE"
+        if failed or not online:
+            interval = last * 2
+        elif now < self._transient_until.get(device_code, 0.0) or _is_transient(
+            previous.get("values", {}), item.get("values", {})
+        ):
+            interval = self._min_interval
+        elif previous.get("values") == item.get("values"):
+            interval = last * 1.5
+        else:
+            interval = self._base_interval
+        interval = min(max(interval, self._min_interval), self._max_interval)
+        self._device_interval[device_code] = interval
+        if device_code in self.push_devices and not failed:
+            interval = max(interval, PUSH_RECONCILE_INTERVAL)
+        self._next_poll[device_code] = now + interval
+
+    async def _limited(self, request: Awaitable[_T]) -> _T:
+        async with self._semaphore:
+            return await request
+
+    async def async_shutdown(self) -> None:
+        while self._flush_handles:
+            self._flush_handles.popitem()[1]()
+        tasks = list(self._write_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for result in self._write_results.values():
+            result.cancel()
+        self._write_results.clear()
+        self._pending_writes.clear()
+        await super().async_shutdown()
+        for shard in self._shards:
+            await shard.async_shutdown()
+        for transport in self._local_transports.values():
+            await transport.async_close()
+
+    def _transports(self, device_code: str) -> list[WarmlinkTransport]:
+        local = self._local_transports.get(device_code)
+        return [local, self.api] if local is not None else [self.api]
+
+    async def _async_read_values(self, device_code: str, codes: list[str]) -> dict[str, Any]:
+        values: dict[str, Any] = {}
+        missing = list(codes)
+        error: WarmlinkError | None = None
+        for transport in self._transports(device_code):
+            wanted = [code for code in missing if transport.supports(code)]
+            if not wanted:
+                continue
+            try:
+                values.update(await self._limited(transport.get_data_by_code(device_code, wanted)))
+            except WarmlinkError as err:
+                _LOGGER.debug("Reading %s over %s failed: %s", device_code, transport.name, err)
+                error = err
+                continue
+            missing = [code for code in missing if code not in values]
+            if not missing:
+                break
+        if not values and error is not None:
+            raise error
+        return values
+
+    async def _async_read_status(
+        self, device_code: str, previous: dict[str, Any]
+    ) -> dict[str, Any]:
+        # The cloud owns the online state; local transports only override the
+        # status codes they map, and keep the last cloud status alive on their own.
+        transports = self._transports(device_code)
+        error: WarmlinkError | None = None
+        try:
+            status = await self._limited(transports[-1].get_device_status(device_code))
+        except WarmlinkError as err:
+            if len(transports) == 1:
+                raise
+            _LOGGER.debug("Status of %s over %s failed: %s", device_code, transports[-1].name, err)
+            status, error = dict(previous), err
+        for transport in transports[:-1]:
+            try:
+                local = await self._limited(transport.get_device_status(device_code))
+            except WarmlinkError as err:
+                _LOGGER.debug("Status of %s over %s failed: %s", device_code, transport.name, err)
+                continue
+            if local:
+                status.update(local)
+                error = None
+        if error is not None:
+            raise error
+        return status
+
+    async def _async_write(self, device_code: str, values: dict[str, str]) -> bool:
+        remaining = dict(values)
+        ok = True
+        transports = self._transports(device_code)
+        for transport in transports:
+            batch = {code: value for code, value in remaining.items() if transport.supports(code)}
+            if not batch:
+                continue
+            last = transport is transports[-1]
+            try:
+                written = await transport.control_many(device_code, batch)
+            except WarmlinkError as err:
+                if last:
+                    raise
+                _LOGGER.debug("Writing %s over %s failed: %s", device_code, transport.name, err)
+                continue
+            if not written and not last:
+                _LOGGER.debug("Writing %s over %s was rejected", device_code, transport.name)
+                continue
+            ok = written and ok
+            for code in batch:
+                del remaining[code]
+            if not remaining:
+                break
+        return ok
+
+    async def _async_fetch_device(
+        self, code: str, device: dict[str, Any], previous: dict[str, Any], now: float
+    ) -> dict[str, Any]:
+        status_due = (
+            not previous.get("status")
+            or now - self._status_at.get(code, 0.0) >= self._status_interval
+        )
+        requests = [self._async_read_values(code, self.codes_for(code))]
+        if status_due:
+            requests.append(self._async_read_status(code, previous.get("status", {})))
+        values, *fetched = await asyncio.gather(*requests)
+        status = fetched[0] if fetched else {}
+        if not status and not values:
+            raise UpdateFailed(f"No data returned for {code}")
+        if status:
+            self._status_at[code] = now
+        else:
+            status = previous.get("status", {})
+        wall = time.time()
+        return {
+            "meta": device,
+            "status": status,
+            "values": {**previous.get("values", {}), **values},
+            "updated": {**previous.get("updated", {}), **dict.fromkeys(values, wall)},
+            "updated_at": wall,
+            "stale": False,
+        }
+
+    @property
+    def metrics(self) -> WarmlinkMetrics | None:
+        return self.api.metrics
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        metrics = self.api.metrics
+        if metrics is None:
+            return await self._async_poll()
+        started = time.monotonic()
+        ok = False
+        try:
+            result = await self._async_poll()
+            ok = True
+            return result
+        finally:
+            metrics.record_refresh(time.monotonic() - started, ok)
+
+    async def _async_ensure_token(self) -> None:
+        try:
+            token = await self.api.ensure_token()
+        except WarmlinkError as err:
+            raise UpdateFailed(f"Login failed: {err}") from err
+        if not token:
+            raise UpdateFailed("Login failed")
+
+    async def _async_poll(self) -> dict[str, Any]:
+        self.changes = {}
+        self.status_changes = {}
+        await self._async_ensure_token()
+
+        now = time.monotonic()
+        if self._inventory_at is None or now - self._inventory_at >= self._inventory_interval:
+            await self._async_refresh_inventory(now)
+        if self._shard_size:
+            return await self._async_poll_sharded()
+
+        devices, next_poll, outage = await self._async_poll_devices(self._inventory, now)
+        delay = self._tick_delay(next_poll, now, devices)
+        if self._phase:
+            delay += self._phase * self._base_interval
+            self._phase = 0.0
+        self.update_interval = timedelta(seconds=delay)
+        self._track_changes(devices)
+        if outage:
+            # Publish the stale flags before failing the update.
+            self.data = {**(self.data or {}), "devices": devices}
+            raise UpdateFailed("Update failed for every due device")
+        self._async_save()
+        return {"devices": devices}
+
+    async def _async_poll_devices(
+        self, devices: dict[str, dict[str, Any]], now: float
+    ) -> tuple[dict[str, dict[str, Any]], float, bool]:
+        previous = (self.data or {}).get("devices", {})
+        due = {
+            code: device
+            for code, device in devices.items()
+            if now + _POLL_SLACK >= self._next_poll.get(code, 0.0)
+        }
+        fetched = await asyncio.gather(
+            *(
+                self._async_fetch_device(code, device, previous.get(code, {}), now)
+                for code, device in due.items()
+            ),
+            return_exceptions=True,
+        )
+        # Devices not polled this round may have changed while the fetches were
+        # in flight (optimistic writes, push deltas, read-backs), so they are taken
+        # from the current data rather than the snapshot read before the gather.
+        current = (self.data or {}).get("devices", {})
+        result: dict[str, dict[str, Any]] = {}
+        failures = 0
+        for code, device in devices.items():
+            if code not in due and code in current:
+                result[code] = self._with_optimistic(code, {**current[code], "meta": device})
+        for (code, device), item in zip(due.items(), fetched):
+            failed = False
+            if isinstance(item, BaseException):
+                if not isinstance(item, Exception):
+                    raise item
+                failed = True
+                failures += 1
+                _LOGGER.warning("Update of %s failed, keeping stale data: %s", code, item)
+                item = {**current.get(code, {}), "meta": device, "stale": True}
+            self._schedule_device(code, previous.get(code, {}), item, failed, now)
+            result[code] = self._with_optimistic(code, item)
+        next_poll = min(
+            (self._next_poll[code] for code in devices if code in self._next_poll),
+            default=now + self._base_interval,
+        )
+        return result, next_poll, bool(due) and failures == len(due)
+
+    def _tick_delay(self, next_poll: float, now: float, device_codes: Iterable[str]) -> float:
+        ceiling = self._max_interval
+        if self.push_devices.issuperset(device_codes):
+            ceiling = max(ceiling, PUSH_RECONCILE_INTERVAL)
+        return min(max(next_poll - now, self._min_interval), ceiling)
+
+    def _async_assign_shards(self) -> None:
+        for code in sorted(self._inventory):
+            if code in self._shard_of:
+                continue
+            shard = self._shards[-1] if self._shards else None
+            if shard is None or len(shard.device_codes) >= self._shard_size:
+                index = len(self._shards)
+                phase = (self._phase + index * PHASE_STEP) % 1
+                shard = WarmlinkShard(self, index, phase)
+                self._shards.append(shard)
+            shard.device_codes.add(code)
+            self._shard_of[code] = shard
+
+    async def _async_poll_sharded(self) -> dict[str, Any]:
+        self._async_assign_shards()
+        pending = [shard for shard in self._shards if shard.data is None]
+        if pending:
+            await asyncio.gather(*(shard.async_refresh() for shard in pending))
+        self.update_interval = timedelta(seconds=self._base_interval)
+        published = (self.data or {}).get("devices", {})
+        return {
+            "devices": {
+                code: {**published[code], "meta": device}
+                for code, device in self._inventory.items()
+                if code in published
             }
-        return result
+        }
+
+    async def _async_poll_shard(self, shard: WarmlinkShard) -> dict[str, Any]:
+        await self._async_ensure_token()
+        now = time.monotonic()
+        devices, next_poll, outage = await self._async_poll_devices(
+            {code: self._inventory[code] for code in shard.device_codes if code in self._inventory},
+            now,
+        )
+        delay = self._tick_delay(next_poll, now, devices)
+        if shard.phase:
+            delay += shard.phase * self._base_interval
+            shard.phase = 0.0
+        shard.update_interval = timedelta(seconds=delay)
+        self._track_changes(devices)
+        published = (self.data or {}).get("devices", {})
+        self.data = {**(self.data or {}), "devices": {**published, **devices}}
+        if outage:
+            shard.data = {"devices": devices}
+            raise UpdateFailed(f"Update failed for every due device in {shard.name}")
+        self._async_save()
+        return {"devices": devices}
+
+    def _async_save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+
+    def _snapshot(self) -> dict[str, Any]:
+        return {
+            "devices": (self.data or {}).get("devices", {}),
+            "energy": {
+                code: [energy.heat_energy, energy.electric_energy]
+                for code, energy in self._energy.items()
+            },
+        }
+
+
+class WarmlinkShard(DataUpdateCoordinator[dict[str, Any]]):
+    def __init__(self, parent: WarmlinkCoordinator, index: int, phase: float) -> None:
+        super().__init__(
+            parent.hass,
+            _LOGGER,
+            name=f"{DOMAIN} shard {index}",
+            update_interval=parent.update_interval,
+        )
+        self.parent = parent
+        self.phase = phase
+        self.device_codes: set[str] = set()
+
+    @property
+    def changes(self) -> dict[str, set[str]]:
+        return self.parent.changes
+
+    @property
+    def status_changes(self) -> dict[str, set[str]]:
+        return self.parent.status_changes
+
+    @property
+    def write_states(self) -> dict[str, dict[str, str]]:
+        return self.parent.write_states
+
+    def device(self, device_code: str) -> WarmlinkDevice:
+        return self.parent.device(device_code)
+
+    def is_fresh(self, device_code: str, codes: tuple[str, ...] = ()) -> bool:
+        return self.parent.is_fresh(device_code, codes)
+
+    @callback
+    def async_register_codes(self, device_code: str, codes: tuple[str, ...]) -> CALLBACK_TYPE:
+        return self.parent.async_register_codes(device_code, codes)
+
+    async def async_control(self, device_code: str, values: dict[str, str]) -> bool:
+        return await self.parent.async_control(device_code, values)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        super().async_update_listeners()
+        self.parent._async_notify_update()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        return await self.parent._async_poll_shard(self)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from .const import DERIVED_MAX_GAP, DERIVED_MIN_ELECTRIC, DERIVED_WINDOW, WATER_KWH_PER_M3_K
+
+DERIVED_INPUT_CODES = ("T01", "T02", "T39", "InputCurrent1")
+
+
+def heat_power(numbers: dict[str, float | None]) -> float | None:
+    flow, outlet, inlet = numbers.get("T39"), numbers.get("T01"), numbers.get("T02")
+    if flow is None or outlet is None or inlet is None:
+        return None
+    return max(0.0, flow * WATER_KWH_PER_M3_K * (outlet - inlet))
+
+
+def electric_power(numbers: dict[str, float | None], voltage: float) -> float | None:
+    current = numbers.get("InputCurrent1")
+    if current is None:
+        return None
+    return max(0.0, current * voltage / 1000)
+
+
+def _trapezoid(
+    previous: tuple[float, float | None, float | None],
+    current: tuple[float, float | None, float | None],
+    index: int,
+) -> float:
+    before, after = previous[index], current[index]
+    elapsed = current[0] - previous[0]
+    if before is None or after is None or not 0 < elapsed <= DERIVED_MAX_GAP:
+        return 0.0
+    return (before + after) / 2 * elapsed / 3600
+
+
+class DerivedEnergy:
+    __slots__ = ("samples", "heat_energy", "electric_energy")
+
+    def __init__(self, heat_energy: float = 0.0, electric_energy: float = 0.0) -> None:
+        self.samples: deque[tuple[float, float | None, float | None]] = deque(
+            maxlen=DERIVED_WINDOW
+        )
+        self.heat_energy = heat_energy
+        self.electric_energy = electric_energy
+
+    def add(self, stamp: float, heat: float | None, electric: float | None) -> None:
+        sample = (stamp, heat, electric)
+        if self.samples:
+            if stamp <= self.samples[-1][0]:
+                return
+            self.heat_energy += _trapezoid(self.samples[-1], sample, 1)
+            self.electric_energy += _trapezoid(self.samples[-1], sample, 2)
+        self.samples.append(sample)
+
+    def window_cop(self) -> float | None:
+        heat = electric = 0.0
+        previous = None
+        for sample in self.samples:
+            if previous is not None:
+                heat += _trapezoid(previous, sample, 1)
+                electric += _trapezoid(previous, sample, 2)
+            previous = sample
+        if electric <= 0:
+            return None
+        return heat / electric
+
+    def values(self, heat: float | None, electric: float | None) -> dict[str, Any]:
+        cop = self.window_cop()
+        if cop is None and heat is not None and electric is not None and electric >= DERIVED_MIN_ELECTRIC:
+            cop = heat / electric
+        return {
+            "heat_power": heat,
+            "electric_power": electric,
+            "cop": round(cop, 2) if cop is not None else None,
+            "heat_energy": round(self.heat_energy, 3),
+            "electric_energy": round(self.electric_energy, 3),
+        }
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+
+
+def parse_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class WarmlinkDevice:
+    __slots__ = (
+        "code",
+        "meta",
+        "status",
+        "values",
+        "numbers",
+        "updated",
+        "updated_at",
+        "stale",
+        "online",
+        "fault",
+        "derived",
+        "device_info",
+    )
+
+    def __init__(self, code: str) -> None:
+        self.code = code
+        self.meta: dict[str, Any] = {}
+        self.status: dict[str, Any] = {}
+        self.values: dict[str, Any] = {}
+        self.numbers: dict[str, float | None] = {}
+        self.updated: dict[str, float] = {}
+        self.updated_at: float | None = None
+        self.stale = False
+        self.online = False
+        self.fault = False
+        self.derived: dict[str, Any] = {}
+        self.device_info = self._build_device_info()
+
+    def _build_device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.code)},
+            name=self.meta.get("deviceName") or self.code,
+            manufacturer="Warmlink",
+            model=self.meta.get("custModel"),
+            configuration_url="https://github.com/00gtw00/homeassistant_warmlink",
+        )
+
+    def update(self, item: dict[str, Any]) -> None:
+        meta = item.get("meta", {})
+        if meta != self.meta:
+            self.meta = meta
+            self.device_info = self._build_device_info()
+        values = item.get("values", {})
+        if values is not self.values:
+            self.values = values
+            self.numbers = {code: parse_float(value) for code, value in values.items()}
+        status = item.get("status", {})
+        if status is not self.status:
+            self.status = status
+            self.online = str(status.get("status")).upper() == "ONLINE"
+            fault = status.get("isFault")
+            if fault is None:
+                fault = status.get("is_fault")
+            self.fault = str(fault).lower() in ("true", "1", "yes")
+        self.updated = item.get("updated", {})
+        self.updated_at = item.get("updated_at")
+        self.stale = bool(item.get("stale"))
+
+    def text(self, code: str) -> str | None:
+        value = self.values.get(code)
+        if value is None or value == "":
+            return None
+        return str(value)
+
+    def is_fresh(self, codes: tuple[str, ...], max_staleness: float) -> bool:
+        stamps = [self.updated[code] for code in codes if code in self.updated]
+        oldest = min(stamps) if stamps else self.updated_at
+        return oldest is not None and time.time() - oldest <= max_staleness
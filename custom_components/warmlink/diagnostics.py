@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import WarmlinkCoordinator
+
+TO_REDACT = {
+    "username",
+    "password",
+    "userName",
+    "x-token",
+    "token",
+    "mac",
+    "sn",
+    "ip",
+    "deviceCode",
+    "deviceName",
+    "local_device",
+    "local_host",
+    "push_topic",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    coordinator: WarmlinkCoordinator = hass.data[DOMAIN][entry.entry_id]
+    metrics = coordinator.metrics
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "update_interval": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "metrics": metrics.as_dict() if metrics is not None else None,
+        "devices": {
+            f"device_{index}": async_redact_data(device, TO_REDACT)
+            for index, device in enumerate((coordinator.data or {}).get("devices", {}).values())
+        },
+    }
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import WarmlinkCoordinator
+
+
+class WarmlinkEntity(CoordinatorEntity[WarmlinkCoordinator]):
+    _codes: tuple[str, ...] = ()
+
+    def __init__(self, coordinator: WarmlinkCoordinator, device_code: str) -> None:
+        super().__init__(coordinator.shard_for(device_code))
+        self._device_code = device_code
+        self._device_state = coordinator.device(device_code)
+        self._attr_device_info = self._device_state.device_info
+        self._written_available: bool | None = None
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.is_fresh(self._device_code, self._codes)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._codes:
+            self.async_on_remove(
+                self.coordinator.async_register_codes(self._device_code, self._codes)
+            )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        states = self.coordinator.write_states.get(self._device_code)
+        if not states:
+            return None
+        written = {code: states[code] for code in self._codes if code in states}
+        return {"write_state": written} if written else None
+
+    def _has_changed(self) -> bool:
+        changed = self.coordinator.changes.get(self._device_code)
+        return bool(changed) and not changed.isdisjoint(self._codes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        available = self.available
+        if available == self._written_available and not self._has_changed():
+            return
+        self._written_available = available
+        self.async_write_ha_state()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import logging
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN,
+    HISTORY_AGGREGATE_SIZE,
+    HISTORY_BUCKET,
+    HISTORY_RAW_SIZE,
+    HISTORY_SAVE_INTERVAL,
+)
+from .coordinator import WarmlinkCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"WLH1"
+_HEADER = struct.Struct("<HHII")
+
+# raw: timestamp, value; aggregates: bucket start, min, mean, max, samples
+_RAW_COLUMNS = "df"
+_AGGREGATE_COLUMNS = "IfffH"
+
+
+class _Ring:
+    __slots__ = ("columns", "size", "head", "count")
+
+    def __init__(self, size: int, typecodes: str) -> None:
+        self.columns = [
+            array(typecode, bytes(array(typecode).itemsize * size)) for typecode in typecodes
+        ]
+        self.size = size
+        self.head = 0
+        self.count = 0
+
+    def append(self, *row: float) -> None:
+        for column, value in zip(self.columns, row):
+            column[self.head] = value
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def last(self, column: int) -> float | None:
+        if not self.count:
+            return None
+        return self.columns[column][(self.head - 1) % self.size]
+
+    def rows(self) -> Iterator[tuple[float, ...]]:
+        start = (self.head - self.count) % self.size
+        for offset in range(self.count):
+            index = (start + offset) % self.size
+            yield tuple(column[index] for column in self.columns)
+
+    def dump(self) -> list[bytes]:
+        start = (self.head - self.count) % self.size
+        end = start + self.count
+        if end <= self.size:
+            return [column[start:end].tobytes() for column in self.columns]
+        end -= self.size
+        return [(column[start:] + column[:end]).tobytes() for column in self.columns]
+
+    def load(self, data: memoryview, count: int) -> int:
+        offset = 0
+        kept = min(count, self.size)
+        for column in self.columns:
+            loaded = array(column.typecode)
+            width = loaded.itemsize * count
+            loaded.frombytes(data[offset : offset + width])
+            column[:kept] = loaded[count - kept :]
+            offset += width
+        self.count = kept
+        self.head = kept % self.size
+        return offset
+
+
+class TelemetrySeries:
+    __slots__ = ("raw", "aggregates", "_bucket")
+
+    def __init__(self) -> None:
+        self.raw = _Ring(HISTORY_RAW_SIZE, _RAW_COLUMNS)
+        self.aggregates = _Ring(HISTORY_AGGREGATE_SIZE, _AGGREGATE_COLUMNS)
+        self._bucket: list[float] | None = None
+
+    def add(self, stamp: float, value: float) -> None:
+        last = self.raw.last(0)
+        if last is not None and stamp <= last:
+            return
+        self.raw.append(stamp, value)
+        start = stamp - stamp % HISTORY_BUCKET
+        if self._bucket is not None and self._bucket[0] != start:
+            self._flush()
+        self._accumulate(start, value)
+
+    def _accumulate(self, start: float, value: float) -> None:
+        bucket = self._bucket
+        if bucket is None:
+            bucket = self._bucket = [start, value, 0.0, value, 0]
+        bucket[1] = min(bucket[1], value)
+        bucket[2] += value
+        bucket[3] = max(bucket[3], value)
+        bucket[4] += 1
+
+    def _flush(self) -> None:
+        start, low, total, high, count = self._bucket
+        self.aggregates.append(int(start), low, total / count, high, int(count))
+        self._bucket = None
+
+    def summary(self, start: float, end: float) -> dict[str, Any]:
+        count = 0
+        total = 0.0
+        low = high = None
+        raw_from = next(self.raw.rows())[0] if self.raw.count else float("inf")
+        # Buckets overlapping the window count whole: older samples only exist at
+        # bucket resolution. Samples still in the raw ring are counted from there.
+        for bucket, b_low, b_mean, b_high, b_count in self.aggregates.rows():
+            if bucket >= raw_from or bucket >= end or bucket + HISTORY_BUCKET <= start:
+                continue
+            b_total = b_mean * b_count
+            if bucket + HISTORY_BUCKET > raw_from:
+                for stamp, value in self.raw.rows():
+                    if stamp >= bucket + HISTORY_BUCKET:
+                        break
+                    b_count -= 1
+                    b_total -= value
+                if b_count <= 0:
+                    continue
+            count += b_count
+            total += b_total
+            low = b_low if low is None else min(low, b_low)
+            high = b_high if high is None else max(high, b_high)
+        for stamp, value in self.raw.rows():
+            if start <= stamp < end:
+                count += 1
+                total += value
+                low = value if low is None else min(low, value)
+                high = value if high is None else max(high, value)
+        return {
+            "min": low,
+            "mean": total / count if count else None,
+            "max": high,
+            "count": count,
+        }
+
+    def dump(self) -> list[bytes]:
+        return self.raw.dump() + self.aggregates.dump()
+
+    def load(self, data: memoryview, raw_count: int, aggregate_count: int) -> int:
+        offset = self.raw.load(data, raw_count)
+        offset += self.aggregates.load(data[offset:], aggregate_count)
+        last = self.raw.last(0)
+        if last is None:
+            return offset
+        start = last - last % HISTORY_BUCKET
+        flushed = self.aggregates.last(0)
+        if flushed is not None and flushed >= start:
+            return offset
+        for stamp, value in self.raw.rows():
+            if stamp >= start:
+                self._accumulate(start, value)
+        return offset
+
+
+class WarmlinkHistory:
+    def __init__(self, hass: HomeAssistant, coordinator: WarmlinkCoordinator, entry_id: str) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._path = hass.config.path(".storage", f"{DOMAIN}.{entry_id}.history")
+        self.series: dict[tuple[str, str], TelemetrySeries] = {}
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+
+    async def async_start(self) -> None:
+        self.series = await self._hass.async_add_executor_job(self._load)
+        self._unsubscribers = [
+            self._coordinator.async_add_update_listener(self.async_record),
+            async_track_time_interval(
+                self._hass, self._async_save, timedelta(seconds=HISTORY_SAVE_INTERVAL)
+            ),
+        ]
+
+    async def async_stop(self) -> None:
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+        await self._async_save()
+
+    @callback
+    def async_record(self) -> None:
+        for device_code, state in self._coordinator.devices.items():
+            for code, stamp in state.updated.items():
+                value = state.numbers.get(code)
+                if value is None:
+                    continue
+                series = self.series.get((device_code, code))
+                if series is None:
+                    series = self.series[(device_code, code)] = TelemetrySeries()
+                series.add(stamp, value)
+
+    def query(
+        self, device_code: str, code: str, start: float, end: float
+    ) -> dict[str, Any] | None:
+        series = self.series.get((device_code, code))
+        return series.summary(start, end) if series is not None else None
+
+    async def _async_save(self, _now: datetime | None = None) -> None:
+        # Only the C-level column copies happen on the event loop; joining and
+        # writing the file run in the executor.
+        await self._hass.async_add_executor_job(self._write, self._chunks())
+
+    def _chunks(self) -> list[bytes]:
+        chunks = [_MAGIC]
+        for (device_code, code), series in self.series.items():
+            device_name, code_name = device_code.encode(), code.encode()
+            chunks.append(
+                _HEADER.pack(
+                    len(device_name), len(code_name), series.raw.count, series.aggregates.count
+                )
+            )
+            chunks.extend((device_name, code_name, *series.dump()))
+        return chunks
+
+    def _load(self) -> dict[tuple[str, str], TelemetrySeries]:
+        try:
+            with open(self._path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return {}
+        try:
+            return decode_history(data)
+        except (ValueError, struct.error, UnicodeDecodeError) as err:
+            _LOGGER.warning("Discarding unreadable telemetry history: %s", err)
+            return {}
+
+    def _write(self, chunks: list[bytes]) -> None:
+        temp = f"{self._path}.tmp"
+        with open(temp, "wb") as file:
+            file.write(b"".join(chunks))
+        os.replace(temp, self._path)
+
+
+def decode_history(data: bytes) -> dict[tuple[str, str], TelemetrySeries]:
+    if not data.startswith(_MAGIC):
+        raise ValueError("unknown history format")
+    series: dict[tuple[str, str], TelemetrySeries] = {}
+    view = memoryview(data)
+    offset = len(_MAGIC)
+    while offset < len(data):
+        device_len, code_len, raw_count, aggregate_count = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        device_code = bytes(view[offset : offset + device_len]).decode()
+        offset += device_len
+        code = bytes(view[offset : offset + code_len]).decode()
+        offset += code_len
+        loaded = series[(device_code, code)] = TelemetrySeries()
+        offset += loaded.load(view[offset:], raw_count, aggregate_count)
+    return series
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .api import CircuitBreaker
+from .const import DATA_HUBS, DOMAIN, PHASE_STEP, RATE_LIMIT_BURST, RATE_LIMIT_PER_SECOND
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class WarmlinkHub:
+    def __init__(self, session: ClientSession) -> None:
+        self.session = session
+        self.limiter = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+        self.breaker = CircuitBreaker()
+        self._entries: dict[str, int] = {}
+        self._next_slot = 0
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    def add_entry(self, entry_id: str) -> float:
+        slot = self._entries.get(entry_id)
+        if slot is None:
+            slot = self._entries[entry_id] = self._next_slot
+            self._next_slot += 1
+        return (slot * PHASE_STEP) % 1.0
+
+    def remove_entry(self, entry_id: str) -> None:
+        self._entries.pop(entry_id, None)
+
+
+def async_get_hub(hass: HomeAssistant, base: str) -> WarmlinkHub:
+    hubs: dict[str, WarmlinkHub] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_HUBS, {})
+    key = base.rstrip("/")
+    hub = hubs.get(key)
+    if hub is None:
+        hub = hubs[key] = WarmlinkHub(async_create_clientsession(hass))
+    return hub
+
+
+async def async_release_hub(hass: HomeAssistant, base: str, entry_id: str) -> None:
+    hubs: dict[str, WarmlinkHub] = hass.data.get(DOMAIN, {}).get(DATA_HUBS, {})
+    key = base.rstrip("/")
+    hub = hubs.get(key)
+    if hub is None:
+        return
+    hub.remove_entry(entry_id)
+    if not hub.entry_count:
+        hubs.pop(key)
+        await hub.session.close()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Any
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, float("inf"))
+
+
+class EndpointStats:
+    __slots__ = ("requests", "failures", "retries", "total_time", "max_time", "buckets")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def record(self, duration: float, ok: bool) -> None:
+        self.requests += 1
+        if not ok:
+            self.failures += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                break
+
+    @property
+    def mean(self) -> float | None:
+        return self.total_time / self.requests if self.requests else None
+
+    def quantile(self, q: float) -> float | None:
+        if not self.requests:
+            return None
+        target = q * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound if bound != float("inf") else self.max_time
+        return self.max_time
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max_time,
+            "histogram": {
+                str(bound): count for bound, count in zip(LATENCY_BUCKETS, self.buckets)
+            },
+        }
+
+
+class WarmlinkMetrics:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.last_refresh: float | None = None
+        self.max_refresh = 0.0
+
+    def endpoint(self, name: str) -> EndpointStats:
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record_refresh(self, duration: float, ok: bool) -> None:
+        self.refreshes += 1
+        if not ok:
+            self.refresh_failures += 1
+        self.last_refresh = duration
+        self.max_refresh = max(self.max_refresh, duration)
+
+    @property
+    def requests(self) -> int:
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def failures(self) -> int:
+        return sum(stats.failures for stats in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        return sum(stats.retries for stats in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "last_refresh": self.last_refresh,
+            "max_refresh": self.max_refresh,
+            "endpoints": {name: stats.as_dict() for name, stats in self.endpoints.items()},
+        }
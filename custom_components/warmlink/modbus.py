@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any
+
+from .api import WarmlinkConnectionError, WarmlinkError
+from .const import API_TIMEOUT, MODBUS_MAX_READ
+
+STATUS_CODES = ("isFault",)
+
+
+@dataclass(frozen=True)
+class ModbusRegister:
+    address: int
+    scale: float = 1.0
+
+
+def parse_register_map(value: str) -> dict[str, ModbusRegister]:
+    registers: dict[str, ModbusRegister] = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        code, _, spec = item.partition("=")
+        address, _, scale = spec.partition(":")
+        try:
+            registers[code.strip()] = ModbusRegister(int(address, 0), float(scale) if scale else 1.0)
+        except ValueError as err:
+            raise ValueError(f"Invalid register mapping {item!r}") from err
+    return registers
+
+
+def _format(raw: int, scale: float) -> str:
+    if raw >= 0x8000:
+        raw -= 0x10000
+    if scale == 1.0:
+        return str(raw)
+    return f"{raw * scale:g}"
+
+
+def _runs(addresses: list[int]) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    for address in sorted(set(addresses)):
+        if runs and address == runs[-1][0] + runs[-1][1] and runs[-1][1] < MODBUS_MAX_READ:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((address, 1))
+    return runs
+
+
+class ModbusTransport:
+    name = "modbus"
+
+    def __init__(
+        self, host: str, port: int, slave: int, registers: dict[str, ModbusRegister]
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._slave = slave
+        self._registers = registers
+        self._client: Any = None
+        self._unit: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    def supports(self, code: str) -> bool:
+        return code in self._registers
+
+    async def _async_client(self) -> Any:
+        if self._client is not None and self._client.connected:
+            return self._client
+        try:
+            from pymodbus.client import AsyncModbusTcpClient
+        except ImportError as err:
+            raise WarmlinkError("Local transport requires the pymodbus package") from err
+        client = AsyncModbusTcpClient(self._host, port=self._port, timeout=API_TIMEOUT)
+        if not await client.connect():
+            raise WarmlinkConnectionError(f"Cannot connect to {self._host}:{self._port}")
+        # pymodbus renamed the unit keyword from slave to device_id in 3.10.
+        parameters = inspect.signature(client.read_holding_registers).parameters
+        self._unit = {"device_id" if "device_id" in parameters else "slave": self._slave}
+        self._client = client
+        return client
+
+    async def _async_read(self, codes: list[str]) -> dict[str, str]:
+        by_address: dict[int, list[str]] = {}
+        for code in codes:
+            register = self._registers.get(code)
+            if register is not None:
+                by_address.setdefault(register.address, []).append(code)
+        result: dict[str, str] = {}
+        if not by_address:
+            return result
+        async with self._lock:
+            try:
+                client = await self._async_client()
+                for start, count in _runs(list(by_address)):
+                    response = await client.read_holding_registers(
+                        start, count=count, **self._unit
+                    )
+                    if response.isError():
+                        raise WarmlinkConnectionError(f"Modbus read at {start} failed: {response}")
+                    for offset, raw in enumerate(response.registers):
+                        for code in by_address.get(start + offset, []):
+                            result[code] = _format(raw, self._registers[code].scale)
+            except WarmlinkError:
+                await self.async_close()
+                raise
+            except Exception as err:
+                await self.async_close()
+                raise WarmlinkConnectionError(f"Modbus read failed: {err}") from err
+        return result
+
+    async def get_device_status(self, device_code: str) -> dict[str, Any]:
+        return await self._async_read([code for code in STATUS_CODES if code in self._registers])
+
+    async def get_data_by_code(self, device_code: str, codes: list[str]) -> dict[str, Any]:
+        return await self._async_read(codes)
+
+    async def control_many(self, device_code: str, values: dict[str, str]) -> bool:
+        writes: list[tuple[int, int]] = []
+        for code, value in values.items():
+            register = self._registers.get(code)
+            if register is None:
+                return False
+            try:
+                writes.append((register.address, round(float(value) / register.scale) & 0xFFFF))
+            except ValueError as err:
+                raise WarmlinkError(f"Invalid value {value!r} for {code}") from err
+        async with self._lock:
+            try:
+                client = await self._async_client()
+                for address, raw in writes:
+                    response = await client.write_register(address, raw, **self._unit)
+                    if response.isError():
+                        return False
+            except WarmlinkError:
+                await self.async_close()
+                raise
+            except Exception as err:
+                await self.async_close()
+                raise WarmlinkConnectionError(f"Modbus write failed: {err}") from err
+        return True
+
+    async def async_close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
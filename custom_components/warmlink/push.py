@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import PUSH_TIMEOUT
+from .coordinator import WarmlinkCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WarmlinkMqttPush:
+    def __init__(self, hass: HomeAssistant, coordinator: WarmlinkCoordinator, topic: str) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._topic = topic.rstrip("/")
+        self._last_message: dict[str, float] = {}
+        self._unsubscribe: CALLBACK_TYPE | None = None
+        self._unsub_watchdog: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> bool:
+        try:
+            from homeassistant.components import mqtt
+
+            if not await mqtt.async_wait_for_mqtt_client(self._hass):
+                _LOGGER.warning("MQTT is not available, staying on polling")
+                return False
+            self._unsubscribe = await mqtt.async_subscribe(
+                self._hass, f"{self._topic}/#", self._async_message_received
+            )
+        except Exception as err:
+            _LOGGER.warning("Subscribing to %s failed, staying on polling: %s", self._topic, err)
+            return False
+        self._unsub_watchdog = async_track_time_interval(
+            self._hass, self._async_check_alive, timedelta(seconds=PUSH_TIMEOUT / 4)
+        )
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        for unsub in (self._unsubscribe, self._unsub_watchdog):
+            if unsub is not None:
+                unsub()
+        self._unsubscribe = self._unsub_watchdog = None
+        self._coordinator.async_end_push(list(self._last_message))
+        self._last_message.clear()
+
+    @callback
+    def _async_message_received(self, msg: Any) -> None:
+        parts = msg.topic[len(self._topic) + 1 :].split("/")
+        payload = msg.payload.decode() if isinstance(msg.payload, bytes) else msg.payload
+        if len(parts) == 1:
+            try:
+                values = json.loads(payload)
+            except ValueError:
+                return
+            if not isinstance(values, dict):
+                return
+        elif len(parts) == 2:
+            values = {parts[1]: payload}
+        else:
+            return
+        if self._coordinator.async_apply_push(parts[0], values):
+            self._last_message[parts[0]] = time.monotonic()
+
+    @callback
+    def _async_check_alive(self, _now: datetime) -> None:
+        now = time.monotonic()
+        silent = [code for code, last in self._last_message.items() if now - last > PUSH_TIMEOUT]
+        if not silent:
+            return
+        for code in silent:
+            del self._last_message[code]
+        _LOGGER.info(
+            "No push updates for %s in %ss, falling back to polling", ", ".join(silent), PUSH_TIMEOUT
+        )
+        self._coordinator.async_end_push(silent)
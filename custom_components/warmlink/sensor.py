@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.const import UnitOfElectricCurrent, UnitOfTemperature, UnitOfVolumeFlowRate
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfElectricCurrent,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+    UnitOfVolumeFlowRate,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import WarmlinkCoordinator
+from .derived import DERIVED_INPUT_CODES
+from .entity import WarmlinkEntity
+from .metrics import WarmlinkMetrics
 
 
 @dataclass
 class WarmlinkSensorDescription(SensorEntityDescription):
     code: str = ""
+    deadband: float | None = None
 
 
 SENSORS: list[WarmlinkSensorDescription] = [
@@ -34,8 +53,91 @@ SENSORS: list[WarmlinkSensorDescription] = [
     WarmlinkSensorDescription(key="silent", name="Silent", code="Manual-mute"),
 ]
 
+DERIVED_SENSORS: list[SensorEntityDescription] = [
+    SensorEntityDescription(
+        key="heat_power",
+        name="Heat output",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="electric_power",
+        name="Electric power",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="cop",
+        name="COP",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:heat-pump-outline",
+    ),
+    SensorEntityDescription(
+        key="heat_energy",
+        name="Heat energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="electric_energy",
+        name="Electric energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+]
+
+
+@dataclass
+class WarmlinkMetricDescription(SensorEntityDescription):
+    value_fn: Callable[[WarmlinkMetrics], float | int | None] = lambda metrics: None
+
+
+METRIC_SENSORS: list[WarmlinkMetricDescription] = [
+    WarmlinkMetricDescription(
+        key="refresh_duration",
+        name="Refresh duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.last_refresh,
+    ),
+    WarmlinkMetricDescription(
+        key="requests",
+        name="Requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.requests,
+    ),
+    WarmlinkMetricDescription(
+        key="request_failures",
+        name="Request failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.failures,
+    ),
+    WarmlinkMetricDescription(
+        key="request_retries",
+        name="Request retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.retries,
+    ),
+    *(
+        WarmlinkMetricDescription(
+            key=f"latency_{endpoint}",
+            name=f"{endpoint} latency",
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=lambda metrics, endpoint=endpoint: metrics.endpoint(endpoint).mean,
+        )
+        for endpoint in ("login", "deviceList", "getDeviceStatus", "getDataByCode", "control")
+    ),
+]
+
 
-class WarmlinkSensor(CoordinatorEntity[WarmlinkCoordinator], SensorEntity):
+class WarmlinkSensor(WarmlinkEntity, SensorEntity):
     entity_description: WarmlinkSensorDescription
 
     def __init__(
@@ -44,46 +146,126 @@ class WarmlinkSensor(CoordinatorEntity[WarmlinkCoordinator], SensorEntity):
         device_code: str,
         description: WarmlinkSensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, device_code)
         self.entity_description = description
-        self._device_code = device_code
+        self._codes = (description.code,)
         self._attr_unique_id = f"{device_code}_{description.key}"
+        self._written_value: str | float | None = None
 
     @property
     def name(self) -> str:
         return f"Warmlink {self._device_code} {self.entity_description.name}"
 
-    @property
-    def device_info(self) -> dict[str, Any]:
-        device = self.coordinator.data.get("devices", {}).get(self._device_code, {}).get("meta", {})
-        model = device.get("custModel") if device else None
-        return {
-            "identifiers": {(DOMAIN, self._device_code)},
-            "name": device.get("deviceName") if device else self._device_code,
-            "manufacturer": "Warmlink",
-            "model": model,
-            "configuration_url": "https://github.com/00gtw00/homeassistant_warmlink",
-        }
+    def _has_changed(self) -> bool:
+        if not super()._has_changed():
+            return False
+        value = self.native_value
+        deadband = self.entity_description.deadband
+        if (
+            deadband
+            and isinstance(value, float)
+            and isinstance(self._written_value, float)
+            and abs(value - self._written_value) < deadband
+        ):
+            return False
+        self._written_value = value
+        return True
 
     @property
     def native_value(self) -> str | float | None:
-        values = self.coordinator.data.get("devices", {}).get(self._device_code, {}).get("values", {})
-        value = values.get(self.entity_description.code)
-        if value is None or value == "":
-            return None
+        code = self.entity_description.code
         if self.entity_description.native_unit_of_measurement:
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return None
-        return str(value)
+            return self._device_state.numbers.get(code)
+        return self._device_state.text(code)
+
+
+class WarmlinkDerivedSensor(WarmlinkEntity, SensorEntity):
+    _codes = DERIVED_INPUT_CODES
+
+    def __init__(
+        self,
+        coordinator: WarmlinkCoordinator,
+        device_code: str,
+        description: SensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator, device_code)
+        self.entity_description = description
+        self._attr_unique_id = f"{device_code}_{description.key}"
+        self._written_value: float | None = None
+
+    @property
+    def name(self) -> str:
+        return f"Warmlink {self._device_code} {self.entity_description.name}"
+
+    def _has_changed(self) -> bool:
+        value = self.native_value
+        if value == self._written_value:
+            return False
+        self._written_value = value
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        return self._device_state.derived.get(self.entity_description.key)
+
+
+class WarmlinkMetricSensor(CoordinatorEntity[WarmlinkCoordinator], SensorEntity):
+    entity_description: WarmlinkMetricDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: WarmlinkCoordinator,
+        entry_id: str,
+        title: str,
+        description: WarmlinkMetricDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._title = title
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            name=f"Warmlink {title}",
+            manufacturer="Warmlink",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def name(self) -> str:
+        return f"Warmlink {self._title} {self.entity_description.name}"
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.metrics is not None
+
+    @property
+    def native_value(self) -> float | int | None:
+        metrics = self.coordinator.metrics
+        return self.entity_description.value_fn(metrics) if metrics is not None else None
 
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:
     coordinator: WarmlinkCoordinator = hass.data[DOMAIN][entry.entry_id]
-    devices = coordinator.data.get("devices", {})
-    entities = []
-    for device_code in devices:
-        for desc in SENSORS:
-            entities.append(WarmlinkSensor(coordinator, device_code, desc))
-    async_add_entities(entities)
+
+    if coordinator.metrics is not None:
+        async_add_entities(
+            WarmlinkMetricSensor(coordinator, entry.entry_id, entry.title, desc)
+            for desc in METRIC_SENSORS
+        )
+
+    @callback
+    def _async_add_devices(device_codes: list[str]) -> None:
+        entities: list[SensorEntity] = [
+            WarmlinkSensor(coordinator, device_code, desc)
+            for device_code in device_codes
+            for desc in SENSORS
+        ]
+        entities.extend(
+            WarmlinkDerivedSensor(coordinator, device_code, desc)
+            for device_code in device_codes
+            for desc in DERIVED_SENSORS
+        )
+        async_add_entities(entities)
+
+    entry.async_on_unload(coordinator.async_add_device_listener(_async_add_devices))
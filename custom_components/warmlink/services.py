@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BULK_WAVE_SIZE,
+    DATA_HISTORY,
+    DOMAIN,
+    HISTORY_DEFAULT_WINDOW,
+    SERVICE_APPLY_SCHEDULE,
+    SERVICE_BULK_CONTROL,
+    SERVICE_QUERY_HISTORY,
+    SERVICE_REFRESH_DEVICES,
+)
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("device_code"): cv.string,
+        vol.Required("code"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+    }
+)
+
+_TARGETS = {
+    vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("device_code"): vol.All(cv.ensure_list, [cv.string]),
+}
+_VALUES = vol.Schema({cv.string: vol.Coerce(str)})
+
+BULK_CONTROL_SCHEMA = vol.All(
+    vol.Schema({**_TARGETS, vol.Required("values"): vol.All(_VALUES, vol.Length(min=1))}),
+    cv.has_at_least_one_key("device_id", "device_code"),
+)
+
+APPLY_SCHEDULE_SCHEMA = vol.All(
+    vol.Schema(
+        {**_TARGETS, vol.Required("steps"): vol.All(cv.ensure_list, [_VALUES], vol.Length(min=1))}
+    ),
+    cv.has_at_least_one_key("device_id", "device_code"),
+)
+
+
+async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+    device_code, code = call.data["device_code"], call.data["code"]
+    end = dt_util.as_utc(call.data.get("end") or dt_util.utcnow()).timestamp()
+    start = (
+        dt_util.as_utc(call.data["start"]).timestamp()
+        if "start" in call.data
+        else end - HISTORY_DEFAULT_WINDOW
+    )
+    for history in call.hass.data.get(DOMAIN, {}).get(DATA_HISTORY, {}).values():
+        result = history.query(device_code, code, start, end)
+        if result is not None:
+            return {
+                "device_code": device_code,
+                "code": code,
+                "start": dt_util.utc_from_timestamp(start).isoformat(),
+                "end": dt_util.utc_from_timestamp(end).isoformat(),
+                **result,
+            }
+    raise ServiceValidationError(f"No history recorded for {code} on {device_code}")
+
+
+def _loaded_coordinators(hass: HomeAssistant) -> list[Any]:
+    loaded = hass.data.get(DOMAIN, {})
+    return [
+        loaded[entry.entry_id]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in loaded
+    ]
+
+
+def _resolve_targets(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+    coordinators = _loaded_coordinators(hass)
+    codes = list(data.get("device_code", []))
+    registry = dr.async_get(hass)
+    for device_id in data.get("device_id", []):
+        device = registry.async_get(device_id)
+        if device is None:
+            raise ServiceValidationError(f"Unknown device {device_id}")
+        codes.extend(code for domain, code in device.identifiers if domain == DOMAIN)
+    targets: dict[str, Any] = {}
+    for code in codes:
+        coordinator = next((c for c in coordinators if code in c.devices), None)
+        if coordinator is None:
+            raise ServiceValidationError(f"Unknown Warmlink device {code}")
+        targets[code] = coordinator
+    return targets
+
+
+async def _async_run_waves(
+    hass: HomeAssistant, data: dict[str, Any], steps: list[dict[str, str]]
+) -> ServiceResponse:
+    targets = _resolve_targets(hass, data)
+    results: dict[str, dict[str, Any]] = {
+        code: {"success": True, "error": None} for code in targets
+    }
+    written: dict[str, dict[str, str]] = {}
+    for values in steps:
+        remaining = [code for code in targets if results[code]["success"]]
+        for start in range(0, len(remaining), BULK_WAVE_SIZE):
+            wave = remaining[start : start + BULK_WAVE_SIZE]
+            outcomes = await asyncio.gather(
+                *(targets[code].async_write_values(code, values) for code in wave),
+                return_exceptions=True,
+            )
+            for code, outcome in zip(wave, outcomes):
+                if isinstance(outcome, BaseException):
+                    if not isinstance(outcome, Exception):
+                        raise outcome
+                    results[code].update(success=False, error=str(outcome))
+                elif not outcome:
+                    results[code].update(success=False, error="Write rejected")
+                else:
+                    written.setdefault(code, {}).update(values)
+    by_coordinator: dict[int, tuple[Any, dict[str, dict[str, str]]]] = {}
+    for code, values in written.items():
+        coordinator = targets[code]
+        by_coordinator.setdefault(id(coordinator), (coordinator, {}))[1][code] = values
+    for coordinator, devices in by_coordinator.values():
+        for code, confirmed in (await coordinator.async_reconcile(devices)).items():
+            results[code]["confirmed"] = confirmed
+    return {"devices": results}
+
+
+async def _async_bulk_control(call: ServiceCall) -> ServiceResponse:
+    return await _async_run_waves(call.hass, call.data, [call.data["values"]])
+
+
+async def _async_apply_schedule(call: ServiceCall) -> ServiceResponse:
+    return await _async_run_waves(call.hass, call.data, call.data["steps"])
+
+
+async def _async_refresh_devices(call: ServiceCall) -> None:
+    await asyncio.gather(
+        *(
+            coordinator.async_request_inventory_refresh()
+            for coordinator in _loaded_coordinators(call.hass)
+        )
+    )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_CONTROL,
+        _async_bulk_control,
+        schema=BULK_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SCHEDULE,
+        _async_apply_schedule,
+        schema=APPLY_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH_DEVICES, _async_refresh_devices)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import (
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_BUFFER_SIZE,
+    BACKFILL_CODES,
+    DOMAIN,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .coordinator import WarmlinkCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = 3600
+
+
+def hourly_statistics(samples: Iterable[tuple[float, float]]) -> Iterator[StatisticData]:
+    hour: float | None = None
+    count = 0
+    total = low = high = 0.0
+    for stamp, value in samples:
+        start = stamp - stamp % _HOUR
+        if start != hour:
+            if hour is not None:
+                yield StatisticData(
+                    start=dt_util.utc_from_timestamp(hour), mean=total / count, min=low, max=high
+                )
+            hour, count, total, low, high = start, 0, 0.0, value, value
+        count += 1
+        total += value
+        low = min(low, value)
+        high = max(high, value)
+    if hour is not None:
+        yield StatisticData(
+            start=dt_util.utc_from_timestamp(hour), mean=total / count, min=low, max=high
+        )
+
+
+class WarmlinkStatisticsImporter:
+    def __init__(
+        self, hass: HomeAssistant, coordinator: WarmlinkCoordinator, entry_id: str
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics"
+        )
+        self._buffers: dict[tuple[str, str], deque[tuple[float, float]]] = {}
+        self._stale: set[str] = set()
+        self._last_run = 0.0
+        self._running = False
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+
+    async def async_start(self) -> None:
+        data = await self._store.async_load() or {}
+        for device_code, code, samples in data.get("buffers", []):
+            if code in BACKFILL_CODES:
+                self._buffers[(device_code, code)] = deque(
+                    ((stamp, value) for stamp, value in samples), maxlen=BACKFILL_BUFFER_SIZE
+                )
+        # The device listener fires right away and appends its own unsubscribers.
+        self._unsubscribers.extend(
+            (
+                self._coordinator.async_add_device_listener(self._async_track_devices),
+                self._coordinator.async_add_update_listener(self.async_handle_update),
+            )
+        )
+
+    async def async_stop(self) -> None:
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+        await self._store.async_save(self._snapshot())
+
+    @callback
+    def _async_track_devices(self, device_codes: list[str]) -> None:
+        # Backfilled codes are polled even when their sensors are disabled.
+        for device_code in device_codes:
+            self._unsubscribers.append(
+                self._coordinator.async_register_codes(device_code, tuple(BACKFILL_CODES))
+            )
+
+    def _snapshot(self) -> dict[str, Any]:
+        return {
+            "buffers": [
+                [device_code, code, list(buffer)]
+                for (device_code, code), buffer in self._buffers.items()
+                if buffer
+            ]
+        }
+
+    @callback
+    def async_handle_update(self) -> None:
+        self._record()
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        # A device that was stale and reports again has just come back from an outage.
+        stale = {code for code, state in self._coordinator.devices.items() if state.stale}
+        recovered = bool(self._stale - stale)
+        self._stale = stale
+        hour = time.time() // _HOUR * _HOUR
+        if self._running or not (recovered or hour > self._last_run):
+            return
+        self._last_run = hour
+        self._running = True
+        self._hass.async_create_background_task(
+            self._async_import(hour), f"{DOMAIN} statistics import"
+        )
+
+    def _record(self) -> None:
+        for device_code, state in self._coordinator.devices.items():
+            for code in BACKFILL_CODES:
+                stamp = state.updated.get(code)
+                value = state.numbers.get(code)
+                if stamp is None or value is None:
+                    continue
+                buffer = self._buffers.get((device_code, code))
+                if buffer is None:
+                    buffer = self._buffers[(device_code, code)] = deque(maxlen=BACKFILL_BUFFER_SIZE)
+                if not buffer or stamp > buffer[-1][0]:
+                    buffer.append((stamp, value))
+
+    async def _async_import(self, end: float) -> None:
+        try:
+            for (device_code, code), buffer in list(self._buffers.items()):
+                await self._async_import_series(device_code, code, buffer, end)
+        finally:
+            self._running = False
+
+    async def _async_import_series(
+        self, device_code: str, code: str, buffer: deque[tuple[float, float]], end: float
+    ) -> None:
+        statistic_id = f"{DOMAIN}:{slugify(device_code)}_{slugify(code)}"
+        since = await self._async_imported_until(statistic_id)
+        samples = [sample for sample in buffer if since <= sample[0] < end]
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"Warmlink {device_code} {code}",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=BACKFILL_CODES[code],
+        )
+        batch: list[StatisticData] = []
+        imported = 0
+        for row in hourly_statistics(samples):
+            batch.append(row)
+            if len(batch) >= BACKFILL_BATCH_SIZE:
+                async_add_external_statistics(self._hass, metadata, batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            async_add_external_statistics(self._hass, metadata, batch)
+            imported += len(batch)
+        while buffer and buffer[0][0] < end:
+            buffer.popleft()
+        if imported:
+            _LOGGER.debug("Imported %s hourly rows into %s", imported, statistic_id)
+
+    async def _async_imported_until(self, statistic_id: str) -> float:
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, True, {"max"}
+        )
+        rows = last.get(statistic_id)
+        if not rows:
+            return 0.0
+        start = rows[0]["start"]
+        if not isinstance(start, (int, float)):
+            start = start.timestamp()
+        return start + _HOUR
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+
+class WarmlinkTransport(Protocol):
+    name: str
+
+    def supports(self, code: str) -> bool: ...
+
+    async def get_device_status(self, device_code: str) -> dict[str, Any]: ...
+
+    async def get_data_by_code(self, device_code: str, codes: list[str]) -> dict[str, Any]: ...
+
+    async def control_many(self, device_code: str, values: dict[str, str]) -> bool: ...
+
+    async def async_close(self) -> None: ...
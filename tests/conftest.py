@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest_asyncio
+from aiohttp import ClientSession
+
+from bench.fake_cloud import FakeCloud, FakeCloudConfig
+
+
+@pytest_asyncio.fixture
+async def cloud():
+    cloud = FakeCloud(FakeCloudConfig(devices=2, latency=0.0, jitter=0.0, retry_after=0.3, hang=0.5))
+    await cloud.start()
+    yield cloud
+    await cloud.stop()
+
+
+@pytest_asyncio.fixture
+async def session():
+    async with ClientSession() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path):
+    from homeassistant.core import HomeAssistant
+
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest_asyncio.fixture
+async def coordinator(hass, cloud, session, monkeypatch):
+    from custom_components.warmlink import coordinator as coordinator_module
+    from custom_components.warmlink.api import WarmlinkApi
+
+    monkeypatch.setattr(coordinator_module, "CONTROL_DEBOUNCE", 0.05)
+    api = WarmlinkApi(session, "user", "secret", cloud.base, password_mode="plain")
+    coordinator = coordinator_module.WarmlinkCoordinator(hass, api)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import ClientSession
+
+from bench.fake_cloud import FakeCloud
+from custom_components.warmlink import api as api_module
+from custom_components.warmlink.api import (
+    CircuitBreaker,
+    WarmlinkApi,
+    WarmlinkAuthError,
+    WarmlinkCircuitOpenError,
+    WarmlinkRateLimitError,
+    WarmlinkResponseError,
+    WarmlinkServerError,
+    WarmlinkTimeoutError,
+)
+
+DEVICE = "DEV0000"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch: pytest.MonkeyPatch) -> list[tuple[float, float]]:
+    jitter: list[tuple[float, float]] = []
+
+    def uniform(low: float, high: float) -> float:
+        jitter.append((low, high))
+        return high
+
+    monkeypatch.setattr(api_module, "API_TIMEOUT", 0.2)
+    monkeypatch.setattr(api_module, "API_RETRY_DELAY", 0.01)
+    monkeypatch.setattr(api_module.random, "uniform", uniform)
+    return jitter
+
+
+def _api(cloud: FakeCloud, session: ClientSession, **kwargs) -> WarmlinkApi:
+    return WarmlinkApi(session, "user", "secret", cloud.base, password_mode="plain", **kwargs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("fault", "error"),
+    [
+        ("timeout", WarmlinkTimeoutError),
+        ("429", WarmlinkRateLimitError),
+        ("503", WarmlinkServerError),
+        ("401", WarmlinkAuthError),
+        ("malformed", WarmlinkResponseError),
+    ],
+)
+async def test_error_classes(cloud, session, fault, error):
+    api = _api(cloud, session)
+    cloud.inject("login", fault)
+    with pytest.raises(error):
+        await api.login_with("plain", retries=0)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_carries_retry_after(cloud, session):
+    api = _api(cloud, session)
+    cloud.inject("login", "429")
+    with pytest.raises(WarmlinkRateLimitError) as err:
+        await api.login_with("plain", retries=0)
+    assert err.value.retry_after == 0.3
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_with_jitter(cloud, session, fast_retries):
+    api = _api(cloud, session)
+    cloud.inject("login", "503", "timeout")
+    assert await api.login_with("plain", retries=2)
+    assert cloud.stats.requests["login"] == 3
+    assert fast_retries == [(0.5, 1.5), (0.5, 1.5)]
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded(cloud, session):
+    api = _api(cloud, session)
+    cloud.inject("login", "503", "503", "503", "503")
+    with pytest.raises(WarmlinkServerError):
+        await api.login_with("plain", retries=2)
+    assert cloud.stats.requests["login"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_retry_after(cloud, session):
+    api = _api(cloud, session)
+    cloud.inject("login", "429")
+    started = time.monotonic()
+    assert await api.login_with("plain", retries=1)
+    assert time.monotonic() - started >= 0.3
+    assert cloud.stats.requests["login"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fault", ["401", "malformed"])
+async def test_permanent_errors_are_not_retried(cloud, session, fault):
+    api = _api(cloud, session)
+    cloud.inject("login", fault)
+    with pytest.raises(api_module.WarmlinkError):
+        await api.login_with("plain", retries=2)
+    assert cloud.stats.requests["login"] == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_probes_half_open(cloud, session):
+    api = _api(cloud, session, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.2))
+    assert await api.ensure_token()
+    cloud.inject("getDeviceStatus", "503", "503")
+    # The second failure opens the breaker, so the last retry never reaches the cloud.
+    with pytest.raises(WarmlinkCircuitOpenError):
+        await api.get_device_status(DEVICE)
+    with pytest.raises(WarmlinkCircuitOpenError):
+        await api.get_device_status(DEVICE)
+    assert cloud.stats.requests["getDeviceStatus"] == 2
+
+    await asyncio.sleep(0.25)
+    cloud.config.latency = 0.1
+    probe, rejected = await asyncio.gather(
+        api.get_device_status(DEVICE),
+        api.get_device_status(DEVICE),
+        return_exceptions=True,
+    )
+    assert probe == {"status": "ONLINE", "isFault": False}
+    assert isinstance(rejected, WarmlinkCircuitOpenError)
+    assert cloud.stats.requests["getDeviceStatus"] == 3
+    assert await api.get_device_status(DEVICE)
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_breaker(cloud, session):
+    api = _api(cloud, session, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.2))
+    assert await api.ensure_token()
+    cloud.inject("getDeviceStatus", "503", "503")
+    with pytest.raises(WarmlinkCircuitOpenError):
+        await api.get_device_status(DEVICE)
+    assert cloud.stats.requests["getDeviceStatus"] == 1
+    await asyncio.sleep(0.25)
+    with pytest.raises(WarmlinkCircuitOpenError):
+        await api.get_device_status(DEVICE)
+    assert cloud.stats.requests["getDeviceStatus"] == 2
+    with pytest.raises(WarmlinkCircuitOpenError):
+        await api.get_device_status(DEVICE)
+    assert cloud.stats.requests["getDeviceStatus"] == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_refreshed_once_for_concurrent_callers(cloud, session):
+    api = _api(cloud, session)
+    assert await api.ensure_token()
+    cloud.expire_token()
+    cloud.config.latency = 0.05
+    results = await asyncio.gather(*(api.get_device_status(DEVICE) for _ in range(5)))
+    assert all(result == {"status": "ONLINE", "isFault": False} for result in results)
+    assert cloud.stats.requests["login"] == 2
+    assert api.token == cloud.token
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.warmlink import compensation as compensation_module  # noqa: E402
+from custom_components.warmlink.compensation import (  # noqa: E402
+    WarmlinkCompensation,
+    curve_setpoint,
+    parse_curve,
+    slope_setpoint,
+)
+
+DEVICE = "DEV0000"
+OTHER = "DEV0001"
+CURVE = parse_curve("-10:45, 0:38, 15:28")
+
+
+def _set_state(coordinator, device_code: str, **values: float) -> None:
+    coordinator.devices[device_code].update(
+        {
+            "values": {"Power": "1", **{code: str(value) for code, value in values.items()}},
+            "status": {"status": "ONLINE"},
+            "updated_at": time.time(),
+        }
+    )
+
+
+def _record_writes(coordinator, monkeypatch) -> list[tuple[str, dict[str, str]]]:
+    writes: list[tuple[str, dict[str, str]]] = []
+
+    async def _control(device_code: str, values: dict[str, str]) -> bool:
+        writes.append((device_code, values))
+        return True
+
+    monkeypatch.setattr(coordinator, "async_control", _control)
+    return writes
+
+
+def test_curve_setpoint_interpolates_and_clamps_to_the_ends():
+    assert curve_setpoint(CURVE, -20) == 45
+    assert curve_setpoint(CURVE, -5) == 41.5
+    assert curve_setpoint(CURVE, 30) == 28
+    assert curve_setpoint([], 5) is None
+
+
+def test_parse_curve_rejects_bad_points():
+    with pytest.raises(ValueError):
+        parse_curve("-10:45, cold:38")
+
+
+def test_setpoint_uses_slope_and_offset_without_curve(hass, coordinator):
+    engine = WarmlinkCompensation(hass, coordinator, [], 1.0)
+    assert slope_setpoint(1.5, 2.0, 0.0) == 52.0
+    assert engine.setpoint({"T04": 0.0, "compensate_slope": 1.5, "compensate_offset": 2.0}) == 52.0
+    assert engine.setpoint({"T04": 0.3, "compensate_slope": 1.0, "compensate_offset": 0.0}) == 39.5
+    assert engine.setpoint({"T04": -40.0, "compensate_slope": 2.0, "compensate_offset": 0.0}) == 60.0
+    assert engine.setpoint({"T04": 0.0, "compensate_slope": 1.0}) is None
+
+
+@pytest.mark.asyncio
+async def test_evaluate_honours_hysteresis(hass, coordinator, monkeypatch):
+    writes = _record_writes(coordinator, monkeypatch)
+    engine = WarmlinkCompensation(hass, coordinator, CURVE, 1.0)
+    _set_state(coordinator, DEVICE, T04=-5, R02=41)
+    _set_state(coordinator, OTHER, T04=-5, R02=35)
+    engine.async_evaluate()
+    await hass.async_block_till_done()
+    assert writes == [(OTHER, {"R02": "41.5"})]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_skips_stale_and_removed_devices(hass, coordinator, monkeypatch):
+    writes = _record_writes(coordinator, monkeypatch)
+    engine = WarmlinkCompensation(hass, coordinator, CURVE, 1.0)
+    _set_state(coordinator, DEVICE, T04=-5, R02=30)
+    coordinator.devices[DEVICE].updated_at = time.time() - 10 * 3600
+    coordinator.device("GONE")
+    _set_state(coordinator, "GONE", T04=-5, R02=30)
+    engine.async_evaluate()
+    await hass.async_block_till_done()
+    assert writes == []
+
+
+@pytest.mark.asyncio
+async def test_evaluate_rate_limits_writes_per_device(hass, coordinator, monkeypatch):
+    writes = _record_writes(coordinator, monkeypatch)
+    clock = [1000.0]
+    monkeypatch.setattr(compensation_module.time, "monotonic", lambda: clock[0])
+    engine = WarmlinkCompensation(hass, coordinator, CURVE, 1.0)
+    _set_state(coordinator, DEVICE, T04=-5, R02=30)
+    engine.async_evaluate()
+    await hass.async_block_till_done()
+
+    clock[0] += compensation_module.COMPENSATION_MIN_INTERVAL - 1
+    _set_state(coordinator, DEVICE, T04=15, R02=41.5)
+    engine.async_evaluate()
+    await hass.async_block_till_done()
+    assert writes == [(DEVICE, {"R02": "41.5"})]
+
+    clock[0] += 1
+    engine.async_evaluate()
+    await hass.async_block_till_done()
+    assert writes[-1] == (DEVICE, {"R02": "28"})
+
+
+@pytest.mark.asyncio
+async def test_start_keeps_code_registrations(hass, coordinator):
+    engine = WarmlinkCompensation(hass, coordinator, CURVE, 1.0)
+    engine.async_start()
+    assert len(engine._unsubscribers) == len(coordinator.inventory) + 2
+    engine.async_stop()
+    assert engine._unsubscribers == []
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.data_entry_flow import FlowResultType  # noqa: E402
+
+from custom_components.warmlink.config_flow import (  # noqa: E402
+    WarmlinkConfigFlow,
+    WarmlinkOptionsFlow,
+)
+from custom_components.warmlink.const import DOMAIN  # noqa: E402
+
+
+def _flow(hass, data=None, options=None) -> WarmlinkOptionsFlow:
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="user",
+        data={"username": "user", "password": "secret", **(data or {})},
+        source="user",
+        options=options or {},
+    )
+    flow = WarmlinkOptionsFlow(entry)
+    flow.hass = hass
+    flow.handler = entry.entry_id
+    flow.flow_id = "test"
+    return flow
+
+
+@pytest.mark.asyncio
+async def test_options_default_to_entry_data_then_options(hass):
+    flow = _flow(hass, {"history": True, "shard_size": 25}, {"shard_size": 50})
+    result = await flow.async_step_init()
+    assert result["type"] == FlowResultType.FORM
+    defaults = {
+        str(key): key.default() for key in result["data_schema"].schema if callable(key.default)
+    }
+    assert defaults["history"] is True
+    assert defaults["shard_size"] == 50
+    assert defaults["compensation"] is False
+
+
+@pytest.mark.asyncio
+async def test_user_step_only_asks_for_credentials_and_endpoint(hass):
+    flow = WarmlinkConfigFlow()
+    flow.hass = hass
+    flow.context = {"source": "user"}
+    result = await flow.async_step_user()
+    assert result["type"] == FlowResultType.FORM
+    assert [str(key) for key in result["data_schema"].schema] == [
+        "username",
+        "password",
+        "base",
+        "lang",
+        "login_source",
+        "area_code",
+        "app_id",
+        "type",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_options_cover_every_tunable(hass):
+    flow = _flow(hass, {"max_staleness": 600, "extra_codes": "T05"})
+    result = await flow.async_step_init()
+    defaults = {
+        str(key): key.default() for key in result["data_schema"].schema if callable(key.default)
+    }
+    assert defaults["max_staleness"] == 600
+    assert defaults["extra_codes"] == "T05"
+    assert {"status_interval", "inventory_interval", "supply_voltage"} <= defaults.keys()
+
+
+@pytest.mark.asyncio
+async def test_options_validate_compensation_curve(hass):
+    flow = _flow(hass)
+    result = await flow.async_step_init({"compensation": True, "compensation_curve": "cold"})
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"compensation_curve": "invalid_curve"}
+
+    user_input = {"compensation": True, "compensation_curve": "-10:45, 15:28"}
+    result = await flow.async_step_init(user_input)
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == user_input
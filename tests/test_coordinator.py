@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.warmlink import coordinator as coordinator_module  # noqa: E402
+from custom_components.warmlink import api as api_module  # noqa: E402
+from custom_components.warmlink.api import CircuitBreaker, WarmlinkApi  # noqa: E402
+from custom_components.warmlink.coordinator import WarmlinkCoordinator  # noqa: E402
+
+DEVICE = "DEV0000"
+OTHER = "DEV0001"
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_debounced_and_confirming_writes(coordinator, cloud):
+    assert await coordinator.async_control(DEVICE, {"R02": "45"})
+    assert coordinator._write_tasks
+    pending = asyncio.create_task(coordinator.async_control(OTHER, {"R02": "40"}))
+    await asyncio.sleep(0)
+    assert coordinator._flush_handles
+
+    started = time.monotonic()
+    await coordinator.async_shutdown()
+    assert time.monotonic() - started < coordinator_module.CONTROL_CONFIRM_DELAY
+    assert not coordinator._write_tasks
+    assert not coordinator._flush_handles
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    await asyncio.sleep(0.1)
+    assert cloud.stats.requests["control"] == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_keeps_updates_to_devices_not_due(coordinator, cloud):
+    coordinator._next_poll[OTHER] = time.monotonic() + 3600
+    coordinator._next_poll[DEVICE] = 0.0
+    cloud.config.latency = 0.1
+    refresh = asyncio.create_task(coordinator.async_refresh())
+    await asyncio.sleep(0.05)
+    coordinator.async_apply_push(OTHER, {"T01": "12.5"})
+    await refresh
+    assert coordinator.data["devices"][OTHER]["values"]["T01"] == "12.5"
+    assert coordinator.devices[OTHER].values["T01"] == "12.5"
+
+
+@pytest.mark.asyncio
+async def test_inventory_refresh_picks_up_new_devices(coordinator, cloud):
+    cloud.codes.append("DEV0002")
+    await coordinator.async_refresh()
+    assert "DEV0002" not in coordinator.data["devices"]
+    await coordinator.async_request_inventory_refresh()
+    assert "DEV0002" in coordinator.data["devices"]
+
+
+@pytest.mark.asyncio
+async def test_update_listeners_fire_on_shard_updates(hass, cloud, session):
+    api = WarmlinkApi(session, "user", "secret", cloud.base, password_mode="plain")
+    coordinator = WarmlinkCoordinator(hass, api, shard_size=1)
+    updates: list[str] = []
+    unsub = coordinator.async_add_update_listener(
+        lambda: updates.append(next(iter(coordinator.changes), ""))
+    )
+    try:
+        await coordinator.async_refresh()
+        assert updates
+        updates.clear()
+        shard = coordinator.shard_for(OTHER)
+        assert shard is not coordinator
+        await shard.async_refresh()
+        assert updates == [OTHER]
+        unsub()
+        await shard.async_refresh()
+        assert updates == [OTHER]
+    finally:
+        await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_push_only_stretches_polling_for_pushed_devices(coordinator):
+    assert not coordinator.async_apply_push("UNKNOWN", {"T01": "1"})
+    assert not coordinator.push_devices
+    assert coordinator.async_apply_push(DEVICE, {"T01": "12.5"})
+    assert coordinator.push_devices == {DEVICE}
+
+    coordinator._next_poll.clear()
+    now = time.monotonic()
+    await coordinator.async_refresh()
+    assert coordinator._next_poll[DEVICE] - now >= coordinator_module.PUSH_RECONCILE_INTERVAL
+    assert coordinator._next_poll[OTHER] - now < coordinator_module.PUSH_RECONCILE_INTERVAL
+    assert coordinator.update_interval.total_seconds() < coordinator_module.PUSH_RECONCILE_INTERVAL
+
+    coordinator.async_end_push([DEVICE])
+    assert not coordinator.push_devices
+    assert coordinator._next_poll[DEVICE] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_outage_fails_the_update_and_marks_devices_stale(coordinator, cloud, monkeypatch):
+    monkeypatch.setattr(api_module, "API_RETRY_DELAY", 0.0)
+    coordinator.api._breaker = CircuitBreaker(failure_threshold=100)
+    coordinator._next_poll.clear()
+    cloud.inject("getDataByCode", *["503"] * 20)
+    cloud.inject("getDeviceStatus", *["503"] * 20)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert all(item["stale"] for item in coordinator.data["devices"].values())
+    assert all(state.stale for state in coordinator.devices.values())
+
+    cloud._faults.clear()
+    coordinator._next_poll.clear()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert not any(state.stale for state in coordinator.devices.values())
+
+
+class _RejectingTransport:
+    name = "local"
+
+    def __init__(self) -> None:
+        self.writes: list[dict[str, str]] = []
+
+    def supports(self, code: str) -> bool:
+        return code == "R02"
+
+    async def control_many(self, device_code: str, values: dict[str, str]) -> bool:
+        self.writes.append(values)
+        return False
+
+    async def async_close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_rejected_local_write_falls_back_to_cloud(coordinator, cloud):
+    local = coordinator._local_transports[DEVICE] = _RejectingTransport()
+    assert await coordinator._async_write(DEVICE, {"R02": "45"})
+    assert local.writes == [{"R02": "45"}]
+    assert cloud.stats.requests["control"] == 1
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+
+from custom_components.warmlink.const import DOMAIN  # noqa: E402
+from custom_components.warmlink.diagnostics import (  # noqa: E402
+    async_get_config_entry_diagnostics,
+)
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_redact_device_codes_and_local_endpoints(hass, coordinator):
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="user",
+        data={"username": "user", "password": "secret", "base": "http://cloud"},
+        source="user",
+        options={
+            "local_device": "DEV0000",
+            "local_host": "192.168.1.20",
+            "push_topic": "warmlink/site",
+            "shard_size": 25,
+        },
+    )
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    dumped = json.dumps(diagnostics, default=str)
+    for secret in ("secret", "DEV0000", "DEV0001", "192.168.1.20", "warmlink/site"):
+        assert secret not in dumped
+    assert diagnostics["options"]["shard_size"] == 25
+    assert list(diagnostics["devices"]) == ["device_0", "device_1"]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.warmlink.const import (  # noqa: E402
+    HISTORY_BUCKET,
+    HISTORY_RAW_SIZE,
+)
+from custom_components.warmlink.history import (  # noqa: E402
+    TelemetrySeries,
+    WarmlinkHistory,
+    _Ring,
+    decode_history,
+)
+
+START = 1_700_000_000.0 + 17
+
+
+def _series(samples: int, step: float = 60.0) -> TelemetrySeries:
+    series = TelemetrySeries()
+    for index in range(samples):
+        series.add(START + index * step, float(index % 50))
+    return series
+
+
+def _encode(series: dict[tuple[str, str], TelemetrySeries]) -> bytes:
+    history = WarmlinkHistory.__new__(WarmlinkHistory)
+    history.series = series
+    return b"".join(history._chunks())
+
+
+def test_summary_covers_raw_and_aggregated_samples():
+    samples = 3000
+    assert samples > HISTORY_RAW_SIZE
+    series = _series(samples)
+    summary = series.summary(0, float("inf"))
+    assert summary["count"] == samples
+    assert (summary["min"], summary["max"]) == (0.0, 49.0)
+    expected = sum(index % 50 for index in range(samples)) / samples
+    assert summary["mean"] == pytest.approx(expected, rel=1e-4)
+
+
+def test_summary_includes_buckets_straddling_the_window():
+    series = _series(3000)
+    bucket = START - START % HISTORY_BUCKET
+    start = bucket + HISTORY_BUCKET * 10 + 30
+    end = START + 3000 * 60
+    in_window = sum(1 for index in range(3000) if START + index * 60 >= start - start % HISTORY_BUCKET)
+    assert series.summary(start, end)["count"] == in_window
+
+
+def test_ring_wraps_and_dumps_in_order():
+    ring = _Ring(4, "df")
+    for index in range(6):
+        ring.append(float(index), float(index) * 10)
+    assert list(ring.rows()) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0), (5.0, 50.0)]
+
+    restored = _Ring(4, "df")
+    data = b"".join(ring.dump())
+    assert restored.load(memoryview(data), ring.count) == len(data)
+    assert list(restored.rows()) == list(ring.rows())
+    restored.append(6.0, 60.0)
+    assert list(restored.rows())[-2:] == [(5.0, 50.0), (6.0, 60.0)]
+
+
+def test_round_trip_preserves_series():
+    original = {("DEV0000", "T01"): _series(3000), ("DEV0001", "T02"): _series(10)}
+    restored = decode_history(_encode(original))
+    assert restored.keys() == original.keys()
+    for key, series in original.items():
+        assert list(restored[key].raw.rows()) == list(series.raw.rows())
+        assert list(restored[key].aggregates.rows()) == list(series.aggregates.rows())
+        assert restored[key].summary(0, float("inf")) == series.summary(0, float("inf"))
+
+
+def test_unknown_format_is_rejected():
+    data = _encode({("DEV0000", "T01"): _series(10)})
+    with pytest.raises(ValueError):
+        decode_history(b"WLH0" + data[4:])
+    with pytest.raises(struct.error):
+        decode_history(data[:10])
+
+
+def test_unreadable_file_is_discarded(tmp_path, caplog):
+    history = WarmlinkHistory.__new__(WarmlinkHistory)
+    history._path = str(tmp_path / "history")
+    assert history._load() == {}
+    (tmp_path / "history").write_bytes(b"WLH9garbage")
+    assert history._load() == {}
+    assert "Discarding unreadable telemetry history" in caplog.text
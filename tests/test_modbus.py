@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+import pytest_asyncio
+
+pymodbus = pytest.importorskip("pymodbus")
+
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusServerContext  # noqa: E402
+from pymodbus.server import ModbusTcpServer  # noqa: E402
+
+try:
+    from pymodbus.datastore import ModbusDeviceContext
+except ImportError:  # pymodbus < 3.10
+    from pymodbus.datastore import ModbusSlaveContext as ModbusDeviceContext
+
+from custom_components.warmlink.modbus import ModbusTransport, parse_register_map  # noqa: E402
+
+REGISTERS = "T01=0:0.1,T02=1:0.1,R02=5,isFault=10"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def simulator():
+    values = [0] * 16
+    values[0] = 215
+    values[1] = 0x10000 - 35
+    values[5] = 45
+    values[10] = 1
+    # Data blocks are addressed one past the protocol address.
+    device = ModbusDeviceContext(hr=ModbusSequentialDataBlock(1, values))
+    context = ModbusServerContext(device, single=True)
+    port = _free_port()
+    server = ModbusTcpServer(context, address=("127.0.0.1", port))
+    task = asyncio.create_task(server.serve_forever())
+    for _ in range(50):
+        try:
+            _reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.02)
+            continue
+        writer.close()
+        break
+    yield port
+    await server.shutdown()
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_reads_scaled_and_signed_values(simulator):
+    transport = ModbusTransport("127.0.0.1", simulator, 1, parse_register_map(REGISTERS))
+    try:
+        values = await transport.get_data_by_code("dev", ["T01", "T02", "R02", "Z99"])
+    finally:
+        await transport.async_close()
+    assert values == {"T01": "21.5", "T02": "-3.5", "R02": "45"}
+
+
+@pytest.mark.asyncio
+async def test_write_is_read_back(simulator):
+    transport = ModbusTransport("127.0.0.1", simulator, 1, parse_register_map(REGISTERS))
+    try:
+        assert await transport.control_many("dev", {"R02": "50"})
+        assert await transport.get_data_by_code("dev", ["R02"]) == {"R02": "50"}
+        assert not await transport.control_many("dev", {"Z99": "1"})
+    finally:
+        await transport.async_close()
+
+
+@pytest.mark.asyncio
+async def test_status_only_reports_mapped_codes(simulator):
+    transport = ModbusTransport("127.0.0.1", simulator, 1, parse_register_map(REGISTERS))
+    try:
+        assert await transport.get_device_status("dev") == {"isFault": "1"}
+    finally:
+        await transport.async_close()
+
+
+@pytest.mark.asyncio
+async def test_status_without_mapping_does_not_connect():
+    transport = ModbusTransport("127.0.0.1", _free_port(), 1, parse_register_map("T01=0"))
+    assert await transport.get_device_status("dev") == {}
+    assert transport._client is None
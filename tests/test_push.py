@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.warmlink.const import PUSH_TIMEOUT  # noqa: E402
+from custom_components.warmlink.push import WarmlinkMqttPush  # noqa: E402
+
+DEVICE = "DEV0000"
+
+
+@pytest.mark.asyncio
+async def test_unknown_devices_do_not_enable_push(hass, coordinator):
+    push = WarmlinkMqttPush(hass, coordinator, "bridge/")
+    push._async_message_received(SimpleNamespace(topic="bridge/NOPE/T01", payload=b"1"))
+    assert not coordinator.push_devices
+
+    push._async_message_received(SimpleNamespace(topic=f"bridge/{DEVICE}/T01", payload=b"12.5"))
+    assert coordinator.push_devices == {DEVICE}
+    assert coordinator.devices[DEVICE].values["T01"] == "12.5"
+
+
+@pytest.mark.asyncio
+async def test_silent_devices_fall_back_to_polling(hass, coordinator):
+    push = WarmlinkMqttPush(hass, coordinator, "bridge")
+    push._async_message_received(
+        SimpleNamespace(topic=f"bridge/{DEVICE}", payload='{"T01": "12.5"}')
+    )
+    push._async_check_alive(None)
+    assert coordinator.push_devices == {DEVICE}
+
+    push._last_message[DEVICE] -= PUSH_TIMEOUT + 1
+    push._async_check_alive(None)
+    assert not coordinator.push_devices
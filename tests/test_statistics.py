@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.warmlink import statistics as statistics_module  # noqa: E402
+from custom_components.warmlink.const import BACKFILL_CODES  # noqa: E402
+from custom_components.warmlink.statistics import (  # noqa: E402
+    WarmlinkStatisticsImporter,
+    hourly_statistics,
+)
+
+DEVICE = "DEV0000"
+HOUR = 3600.0
+BASE = 1_700_000_000 // 3600 * 3600.0
+
+
+def test_hourly_statistics_aggregates_per_hour():
+    samples = [(BASE, 10.0), (BASE + 60, 20.0), (BASE + 120, 30.0), (BASE + HOUR + 5, 5.0)]
+    rows = list(hourly_statistics(samples))
+    assert [row["start"] for row in rows] == [
+        dt_util.utc_from_timestamp(BASE),
+        dt_util.utc_from_timestamp(BASE + HOUR),
+    ]
+    assert (rows[0]["min"], rows[0]["mean"], rows[0]["max"]) == (10.0, 20.0, 30.0)
+    assert (rows[1]["min"], rows[1]["mean"], rows[1]["max"]) == (5.0, 5.0, 5.0)
+
+
+@pytest.mark.asyncio
+async def test_import_skips_imported_hours_and_trims_the_buffer(hass, coordinator, monkeypatch):
+    imported: list[tuple[str, list]] = []
+    monkeypatch.setattr(
+        statistics_module,
+        "async_add_external_statistics",
+        lambda _hass, metadata, rows: imported.append((metadata["statistic_id"], list(rows))),
+    )
+    importer = WarmlinkStatisticsImporter(hass, coordinator, "entry")
+
+    async def _imported_until(statistic_id: str) -> float:
+        return BASE + HOUR
+
+    monkeypatch.setattr(importer, "_async_imported_until", _imported_until)
+    importer._buffers[(DEVICE, "T01")] = statistics_module.deque(
+        [(BASE + offset * 600, float(offset)) for offset in range(24)]
+    )
+    await importer._async_import(BASE + 3 * HOUR)
+
+    assert [statistic_id for statistic_id, _ in imported] == ["warmlink:dev0000_t01"]
+    rows = imported[0][1]
+    assert [row["start"] for row in rows] == [
+        dt_util.utc_from_timestamp(BASE + HOUR),
+        dt_util.utc_from_timestamp(BASE + 2 * HOUR),
+    ]
+    assert (rows[0]["min"], rows[0]["mean"], rows[0]["max"]) == (6.0, 8.5, 11.0)
+    assert [stamp for stamp, _ in importer._buffers[(DEVICE, "T01")]] == [
+        BASE + offset * 600 for offset in range(18, 24)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_backfill_codes_are_polled_without_their_sensors(hass, coordinator):
+    coordinator.async_register_codes(DEVICE, ("R02",))
+    assert coordinator.codes_for(DEVICE) == ["R02"]
+    importer = WarmlinkStatisticsImporter(hass, coordinator, "entry")
+    await importer.async_start()
+    assert set(BACKFILL_CODES) <= set(coordinator.codes_for(DEVICE))
+    await importer.async_stop()
+    assert coordinator.codes_for(DEVICE) == ["R02"]
+
+
+@pytest.mark.asyncio
+async def test_import_runs_when_a_stale_device_recovers(hass, coordinator, monkeypatch):
+    runs: list[float] = []
+    importer = WarmlinkStatisticsImporter(hass, coordinator, "entry")
+
+    async def _import(end: float) -> None:
+        runs.append(end)
+        importer._running = False
+
+    monkeypatch.setattr(importer, "_async_import", _import)
+    importer._last_run = float("inf")
+    await importer.async_start()
+
+    coordinator.devices[DEVICE].stale = True
+    importer.async_handle_update()
+    await hass.async_block_till_done()
+    assert runs == []
+
+    coordinator.devices[DEVICE].stale = False
+    importer.async_handle_update()
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    await importer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_backfill_buffer_survives_restart(hass, coordinator):
+    importer = WarmlinkStatisticsImporter(hass, coordinator, "entry")
+    importer._buffers[(DEVICE, "T01")] = statistics_module.deque([(BASE, 21.5), (BASE + 60, 22.0)])
+    await importer.async_stop()
+
+    restored = WarmlinkStatisticsImporter(hass, coordinator, "entry")
+    await restored.async_start()
+    assert list(restored._buffers[(DEVICE, "T01")]) == [(BASE, 21.5), (BASE + 60, 22.0)]
+    await restored.async_stop()